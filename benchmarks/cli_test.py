@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+
+def _run(*args):
+    return subprocess.run(
+        [sys.executable, "-c", "from model_metadata.main import main; main()", *args],
+        capture_output=True,
+        check=True,
+    )
+
+
+@pytest.mark.parametrize("args", (("--version",), ("--help",)))
+def test_cli_cold_start(benchmark, args):
+    benchmark.pedantic(_run, args, rounds=10)
+
+
+def test_cli_query(benchmark, model_factory):
+    model = str(model_factory(n_params=100))
+    proc = benchmark.pedantic(_run, ("query", "--var=info.version", model), rounds=10)
+    assert b"10.6" in proc.stdout
@@ -0,0 +1,99 @@
+# Synthetic models for benchmarking, built from the metadata in tests/data
+# and scaled up to have many parameters, large templates or large data files.
+from __future__ import annotations
+
+import pathlib
+import shutil
+from typing import Any
+
+import pytest
+import yaml
+from model_metadata import ModelMetadata
+
+TEST_DATA = pathlib.Path(__file__).parent.parent / "tests" / "data"
+
+
+def make_parameters(n_params: int) -> dict[str, Any]:
+    """Make a parameters section with a mix of parameter types."""
+    parameters: dict[str, Any] = {}
+    for n in range(n_params):
+        kind = n % 4
+        if kind == 0:
+            value = {
+                "type": "float",
+                "default": 1.5 * n,
+                "range": {"min": 0.0, "max": 1e6},
+                "units": "m",
+            }
+        elif kind == 1:
+            value = {
+                "type": "int",
+                "default": n,
+                "range": {"min": 0, "max": 1000000},
+                "units": "1",
+            }
+        elif kind == 2:
+            value = {"type": "choice", "default": "b", "choices": ["a", "b", "c"]}
+        else:
+            value = {"type": "string", "default": f"file-{n}.txt"}
+        parameters[f"param_{n}"] = {"description": f"Parameter {n}", "value": value}
+    return parameters
+
+
+def make_template(n_lines: int, n_params: int, old_style: bool = False) -> str:
+    """Make a template with a few placeholders and many lines of data."""
+    open_, close = ("{", "}") if old_style else ("{{ ", " }}")
+    lines = [f"param_{n}: {open_}param_{n}{close}\n" for n in range(n_params)]
+    row = " ".join(["1.0"] * 16) + "\n"
+    lines.extend(row for _ in range(n_lines))
+    return "".join(lines)
+
+
+def write_model(
+    path: pathlib.Path,
+    n_params: int = 10,
+    n_template_lines: int = 10,
+    n_binary_files: int = 0,
+    binary_size: int = 0,
+    old_style: bool = False,
+) -> pathlib.Path:
+    """Write a synthetic model's metadata, templates and data files."""
+    path.mkdir(parents=True, exist_ok=True)
+    for fname in ("api.yaml", "info.yaml", "run.yaml"):
+        shutil.copy(TEST_DATA / fname, path / fname)
+
+    with open(path / "parameters.yaml", "w") as fp:
+        yaml.safe_dump(make_parameters(n_params), fp)
+
+    (path / "child.in").write_text(
+        make_template(n_template_lines, min(n_params, 10), old_style=old_style)
+    )
+
+    block = bytes(range(256)) * 4096
+    for n in range(n_binary_files):
+        with open(path / f"grid-{n}.bin", "wb") as fp:
+            remaining = binary_size
+            while remaining > 0:
+                fp.write(block[:remaining])
+                remaining -= len(block)
+
+    return path
+
+
+@pytest.fixture(autouse=True)
+def no_caches(monkeypatch):
+    monkeypatch.setattr(ModelMetadata, "disk_cache", None)
+    ModelMetadata.cache.clear()
+
+
+@pytest.fixture(scope="session")
+def model_factory(tmp_path_factory):
+    models: dict[tuple[Any, ...], pathlib.Path] = {}
+
+    def _model(**kwds: Any) -> pathlib.Path:
+        key = tuple(sorted(kwds.items()))
+        if key not in models:
+            models[key] = write_model(tmp_path_factory.mktemp("model"), **kwds)
+        return models[key]
+
+    return _model
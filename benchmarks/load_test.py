@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import pytest
+from model_metadata import ModelMetadata
+from model_metadata.load import load_meta_section
+
+
+@pytest.mark.parametrize("n_params", (10, 100, 1000))
+def test_model_metadata(benchmark, model_factory, n_params):
+    path = model_factory(n_params=n_params)
+    meta = benchmark(ModelMetadata, str(path))
+    assert len(meta.parameters) == n_params
+
+
+@pytest.mark.parametrize("n_params", (10, 100, 1000))
+def test_model_metadata_cached(benchmark, model_factory, n_params):
+    path = model_factory(n_params=n_params)
+    meta = benchmark(ModelMetadata.load, str(path))
+    assert len(meta.parameters) == n_params
+
+
+@pytest.mark.parametrize("n_params", (10, 100, 1000))
+def test_load_meta_section(benchmark, model_factory, n_params):
+    path = model_factory(n_params=n_params)
+    parameters = benchmark(load_meta_section, str(path), "parameters")
+    assert len(parameters) == n_params
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import tracemalloc
+
+import pytest
+from model_metadata.model_parameter import FloatParameter
+from model_metadata.model_parameter import normalize_parameters
+from model_metadata.model_parameter import parameter_from_dict
+from model_metadata.parameter_table import ParameterTable
+
+from .conftest import make_parameters
+
+
+def _parse_all(parameters):
+    return [parameter_from_dict(param).as_dict() for param in parameters.values()]
+
+
+@pytest.mark.parametrize("n_params", (10, 100, 10000))
+def test_parameter_from_dict(benchmark, n_params):
+    parameters = make_parameters(n_params)
+
+    parsed = benchmark(_parse_all, parameters)
+    assert len(parsed) == n_params
+
+
+@pytest.mark.parametrize("n_params", (10, 100, 10000))
+def test_normalize_parameters(benchmark, n_params):
+    parameters = make_parameters(n_params)
+
+    normed = benchmark(normalize_parameters, parameters)
+    assert len(normed) == n_params
+
+
+class UnslottedFloatParameter(FloatParameter):
+    """A float parameter that, like parameters used to, has a __dict__."""
+
+
+def _allocated(func, *args):
+    tracemalloc.start()
+    try:
+        objs = func(*args)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del objs
+    return size
+
+
+def _make_parameters(cls, n_params):
+    return [cls(float(n), desc="x", range=(0, 1e6), units="m") for n in range(n_params)]
+
+
+def test_parameter_memory(benchmark):
+    n_params = 100_000
+
+    slotted = _allocated(_make_parameters, FloatParameter, n_params)
+    unslotted = _allocated(_make_parameters, UnslottedFloatParameter, n_params)
+    benchmark.extra_info.update(
+        {
+            "bytes_per_parameter": slotted / n_params,
+            "unslotted_bytes_per_parameter": unslotted / n_params,
+        }
+    )
+
+    benchmark.pedantic(_make_parameters, (FloatParameter, n_params), rounds=3)
+
+    assert slotted < unslotted
+
+
+@pytest.mark.parametrize("cls", (FloatParameter, UnslottedFloatParameter))
+def test_parameter_construction(benchmark, cls):
+    params = benchmark(_make_parameters, cls, 100_000)
+    assert len(params) == 100_000
+
+
+@pytest.mark.parametrize("n_samples", (1000, 100000))
+def test_check_samples(benchmark, n_samples):
+    np = pytest.importorskip("numpy")
+
+    table = ParameterTable(normalize_parameters(make_parameters(8)))
+    numeric = [name for name, is_number in zip(table, table.numeric) if is_number]
+    rng = np.random.default_rng(1973)
+    samples = rng.uniform(-1e5, 1e6, size=(n_samples, len(numeric))).round()
+
+    valid, violations = benchmark(table.check_samples, samples, names=numeric)
+    assert valid.shape == (n_samples,)
+    assert all(count > 0 for count in violations.values())
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pytest
+from model_metadata import ModelMetadata
+from model_metadata.api import query
+from model_metadata.api import query_many
+
+N_PARAMS = 1000
+
+
+@pytest.fixture
+def model(model_factory):
+    return str(model_factory(n_params=N_PARAMS))
+
+
+def test_query(benchmark, model):
+    assert benchmark(query, model, "info.version") == "10.6"
+
+
+def test_query_cold(benchmark, model):
+    version = benchmark.pedantic(
+        query, (model, "info.version"), setup=ModelMetadata.cache.clear, rounds=20
+    )
+    assert version == "10.6"
+
+
+@pytest.mark.parametrize("n_vars", (10, 100))
+def test_query_many(benchmark, model, n_vars):
+    vars = [f"parameters.param_{n}.value.default" for n in range(n_vars)]
+    assert len(benchmark(query_many, model, vars)) == n_vars
+
+
+@pytest.mark.parametrize("n_vars", (10, 100))
+def test_query_one_at_a_time(benchmark, model, n_vars):
+    vars = [f"parameters.param_{n}.value.default" for n in range(n_vars)]
+
+    def _query_all():
+        return [query(model, var) for var in vars]
+
+    assert len(benchmark(_query_all)) == n_vars
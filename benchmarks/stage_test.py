@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import itertools
+
+import pytest
+from model_metadata.api import stage
+
+MB = 2**20
+_run = itertools.count()
+
+
+@pytest.fixture
+def dest(tmp_path):
+    def _dest():
+        return (), {"dest": str(tmp_path / f"run-{next(_run)}")}
+
+    return _dest
+
+
+def _stage(model, **kwds):
+    def _stage_into(dest):
+        return stage(model, dest, **kwds)
+
+    return _stage_into
+
+
+@pytest.mark.parametrize("old_style", (False, True))
+@pytest.mark.parametrize("n_template_lines", (10, 100000))
+def test_stage_template(benchmark, model_factory, dest, n_template_lines, old_style):
+    model = str(model_factory(n_template_lines=n_template_lines, old_style=old_style))
+
+    manifest = benchmark.pedantic(
+        _stage(model, old_style_templates=old_style), setup=dest, rounds=10
+    )
+    assert list(manifest) == ["child.in"]
+
+
+@pytest.mark.parametrize("link_mode", ("copy", "hardlink", "reflink"))
+def test_stage_binary_files(benchmark, model_factory, dest, link_mode):
+    model = str(model_factory(n_binary_files=4, binary_size=16 * MB))
+
+    manifest = benchmark.pedantic(
+        _stage(model, link_mode=link_mode), setup=dest, rounds=5
+    )
+    assert len(manifest) == 5
+
+
+def test_stage_incremental(benchmark, model_factory, tmp_path):
+    model = str(model_factory(n_binary_files=4, binary_size=16 * MB))
+    stage(model, str(tmp_path), incremental=True)
+
+    manifest = benchmark(stage, model, str(tmp_path), incremental=True)
+    assert len(manifest.skipped) == 5
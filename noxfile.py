@@ -28,6 +28,27 @@ def test(session: nox.Session) -> None:
     session.run("coverage", "xml", "-o", "coverage.xml")
 
 
+@nox.session
+def bench(session: nox.Session) -> None:
+    """Run the benchmarks.
+
+    Extra arguments are passed to pytest, for example, to save a run and
+    compare against it later: ``nox -s bench -- --benchmark-autosave`` and
+    ``nox -s bench -- --benchmark-compare``.
+    """
+    session.install("-r", "requirements-benchmarks.txt")
+    session.install(".")
+
+    session.run(
+        "pytest",
+        "benchmarks",
+        "--benchmark-only",
+        "--benchmark-group-by=func",
+        "--benchmark-storage=file://./build/benchmarks",
+        *session.posargs,
+    )
+
+
 @nox.session(name="test-cli")
 def test_cli(session: nox.Session) -> None:
     """Test the command line interface."""
@@ -38,6 +59,7 @@ def test_cli(session: nox.Session) -> None:
     session.run("model-metadata", "find", "--help")
     session.run("model-metadata", "query", "--help")
     session.run("model-metadata", "stage", "--help")
+    session.run("model-metadata", "index", "--help")
 
 
 @nox.session
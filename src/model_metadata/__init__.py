@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import importlib
+from typing import Any
+from typing import TYPE_CHECKING
+
 from model_metadata._version import __version__
-from model_metadata.errors import MetadataNotFoundError
-from model_metadata.model_info import ModelInfo
-from model_metadata.modelmetadata import ModelMetadata
+
+if TYPE_CHECKING:  # pragma: no cover
+    from model_metadata.errors import MetadataNotFoundError
+    from model_metadata.model_info import ModelInfo
+    from model_metadata.modelmetadata import ModelMetadata
 
 
 __all__ = [
@@ -12,3 +18,25 @@ __all__ = [
     "ModelMetadata",
     "MetadataNotFoundError",
 ]
+
+_LAZY_ATTRS = {
+    "ModelInfo": "model_metadata.model_info",
+    "ModelMetadata": "model_metadata.modelmetadata",
+    "MetadataNotFoundError": "model_metadata.errors",
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,16 +1,15 @@
 from __future__ import annotations
 
+import ast
 import contextlib
-import importlib
+import functools
+import importlib.util
 import keyword
 import os
-import re
-from collections import OrderedDict
+import shutil
 from collections.abc import Generator
-from collections.abc import Sequence
 from typing import Any
 
-import yaml
 from model_metadata.errors import BadEntryPointError
 
 
@@ -44,73 +43,272 @@ def load_component(module_name: str, class_name: str) -> type[Any]:
     return component
 
 
+def find_component_metadata(
+    module_name: str, class_name: str
+) -> tuple[str, str] | None:
+    """Find a component's *METADATA* attribute without importing its module.
+
+    The component's module is located with :func:`importlib.util.find_spec`
+    and its source is inspected for a class-level assignment of
+    *METADATA* to a string or a :class:`pathlib.Path` built from a string.
+    Note that locating a module in a package imports its parent packages.
+
+    Parameters
+    ----------
+    module_name : str
+        Name of the module that contains the component.
+    class_name : str
+        Name of the component's class.
+
+    Returns
+    -------
+    tuple of str or None
+        Path to the folder containing the module and the value of
+        *METADATA*, or ``None`` if these cannot be found statically.
+    """
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+
+    if spec is None or not spec.has_location or not spec.origin:
+        return None
+    if not spec.origin.endswith(".py"):
+        return None
+
+    try:
+        with open(spec.origin, "rb") as fp:
+            tree = ast.parse(fp.read(), filename=spec.origin)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    class_node = None
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            class_node = node
+    if class_node is None:
+        return None
+
+    metadata = _find_metadata_assignment(class_node)
+    if metadata is None:
+        return None
+    else:
+        return os.path.dirname(spec.origin), metadata
+
+
+def _find_metadata_assignment(class_node: ast.ClassDef) -> str | None:
+    value = None
+    for node in class_node.body:
+        if (
+            isinstance(node, ast.Assign)
+            and any(
+                isinstance(target, ast.Name) and target.id == "METADATA"
+                for target in node.targets
+            )
+        ) or (
+            isinstance(node, ast.AnnAssign)
+            and isinstance(node.target, ast.Name)
+            and node.target.id == "METADATA"
+        ):
+            value = node.value
+
+    if isinstance(value, ast.Constant) and isinstance(value.value, str):
+        return value.value
+    elif (
+        isinstance(value, ast.Call)
+        and _call_name(value.func) in ("Path", "PurePath", "PosixPath", "WindowsPath")
+        and not value.keywords
+    ):
+        parts = [
+            arg.value
+            for arg in value.args
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str)
+        ]
+        if len(parts) == len(value.args):
+            return os.path.join(*parts) if parts else "."
+
+    return None
+
+
+def _call_name(func: ast.expr) -> str | None:
+    if isinstance(func, ast.Name):
+        return func.id
+    elif isinstance(func, ast.Attribute):
+        return func.attr
+    else:
+        return None
+
+
 @contextlib.contextmanager
 def as_cwd(path: str, create: bool = True) -> Generator[None]:
+    """Temporarily change the current working directory.
+
+    The previous working directory is restored even if an exception is
+    raised. Note that the working directory is shared by all threads of
+    a process, so this isn't safe to use from more than one thread.
+    """
     prev_cwd = os.getcwd()
 
     if create:
         os.makedirs(os.path.realpath(path), exist_ok=True)
     os.chdir(path)
 
-    yield
-    os.chdir(prev_cwd)
+    try:
+        yield
+    finally:
+        os.chdir(prev_cwd)
 
 
-def is_text_file(path: str) -> bool:
-    """Check if a file is text."""
-    # https://stackoverflow.com/questions/898669
-    TEXT_CHARS = bytearray({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7F})
-    with open(path, "rb") as fp:
-        return not bool(fp.read(1024).translate(None, TEXT_CHARS))
+LINK_MODES = ("copy", "hardlink", "symlink", "reflink")
 
+# ioctl request to clone a file's extents, from linux/fs.h
+_FICLONE = 0x40049409
 
-def setup_yaml_with_canonical_dict() -> None:
-    """https://stackoverflow.com/a/8661021"""
-    yaml.add_representer(
-        OrderedDict,
-        lambda self, data: self.represent_mapping(
-            "tag:yaml.org,2002:map", data.items()
-        ),
-        Dumper=yaml.SafeDumper,
-    )
 
-    def repr_ordered_dict(self: Any, data: dict[str, Any]) -> Any:
-        return self.represent_mapping("tag:yaml.org,2002:map", data.items())
+def link_file(src: str, dst: str, mode: str = "copy") -> str:
+    """Stage a file by copying or linking it.
 
-    yaml.add_representer(dict, repr_ordered_dict, Dumper=yaml.SafeDumper)
+    If the file can't be linked in the requested way (the source and
+    destination are on different file systems, for instance, or the file
+    system doesn't support reflinks) it is copied instead. An existing
+    destination file is replaced.
 
-    def repr_dict(self: Any, data: dict[str, Any]) -> Any:
-        return self.represent_mapping(
-            "tag:yaml.org,2002:map", sorted(data.items(), key=lambda t: t[0])
+    Parameters
+    ----------
+    src : str
+        Path to the source file.
+    dst : str
+        Path to the destination file.
+    mode : {"copy", "hardlink", "symlink", "reflink"}, optional
+        How to stage the file. A *symlink* points to the absolute path
+        of the source file, while a *reflink* is a copy-on-write clone
+        of it.
+
+    Returns
+    -------
+    str
+        The way the file was actually staged.
+    """
+    validate_link_mode(mode)
+
+    if os.path.lexists(dst):
+        os.remove(dst)
+
+    if mode != "copy":
+        try:
+            if mode == "hardlink":
+                os.link(src, dst)
+            elif mode == "symlink":
+                os.symlink(os.path.abspath(src), dst)
+            else:
+                _reflink(src, dst)
+        except (OSError, ImportError):
+            if os.path.lexists(dst):
+                os.remove(dst)
+        else:
+            return mode
+
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def validate_link_mode(mode: str) -> str:
+    if mode not in LINK_MODES:
+        raise ValueError(
+            f"{mode!r}: invalid link mode (not one of {', '.join(LINK_MODES)})"
         )
+    return mode
 
-    yaml.add_representer(dict, repr_dict, Dumper=yaml.SafeDumper)
-
-    # https://stackoverflow.com/a/45004464
-    def repr_str(dumper: Any, data: str) -> Any:
-        if "\n" in data:
-            return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
-        return dumper.represent_str(data)
-
-    yaml.add_representer(str, repr_str, Dumper=yaml.SafeDumper)
-
-    def repr_tuple(dumper: Any, data: Sequence[Any]) -> Any:
-        return dumper.represent_sequence("tag:yaml.org,2002:seq", list(data))
-
-    yaml.add_representer(tuple, repr_tuple, Dumper=yaml.SafeDumper)
-
-    yaml.add_implicit_resolver(
-        "tag:yaml.org,2002:float",
-        re.compile(
-            r"""^(?:
-         [-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+]?[0-9]+)?
-        |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
-        |[-+]?\.[0-9_]+(?:[eE][-+]?[0-9]+)
-        |[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\.[0-9_]*
-        |[-+]?\.(?:inf|Inf|INF)
-        |\.(?:nan|NaN|NAN))$""",
-            re.X,
-        ),
-        list("-+0123456789."),
-        Loader=yaml.SafeLoader,
+
+def _reflink(src: str, dst: str) -> None:
+    import fcntl
+
+    with open(src, "rb") as src_fp, open(dst, "wb") as dst_fp:
+        fcntl.ioctl(dst_fp.fileno(), _FICLONE, src_fp.fileno())
+    shutil.copystat(src, dst)
+
+
+TEXT_EXTENSIONS = frozenset(
+    (
+        ".cfg",
+        ".csv",
+        ".in",
+        ".ini",
+        ".json",
+        ".md",
+        ".nml",
+        ".rst",
+        ".tmpl",
+        ".toml",
+        ".txt",
+        ".xml",
+        ".yaml",
+        ".yml",
+    )
+)
+BINARY_EXTENSIONS = frozenset(
+    (
+        ".bin",
+        ".bz2",
+        ".gif",
+        ".grb",
+        ".grb2",
+        ".grib",
+        ".gz",
+        ".h5",
+        ".hdf5",
+        ".jpeg",
+        ".jpg",
+        ".nc",
+        ".nc4",
+        ".npy",
+        ".npz",
+        ".pickle",
+        ".pkl",
+        ".png",
+        ".tar",
+        ".tif",
+        ".tiff",
+        ".xz",
+        ".zip",
     )
+)
+
+# https://stackoverflow.com/questions/898669
+_TEXT_CHARS = bytes(
+    sorted({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7F})
+)
+
+
+def is_text_file(path: str) -> bool:
+    """Check if a file is text.
+
+    Files with a well-known text or binary extension are classified by
+    their name alone. Other files are classified by looking for binary
+    characters in their first 1 KiB, and the result is cached until
+    the file's modification time or size changes.
+
+    Parameters
+    ----------
+    path : str
+        Path to a file.
+
+    Returns
+    -------
+    bool
+        ``True`` if the file is text, otherwise ``False``.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in TEXT_EXTENSIONS:
+        return True
+    elif ext in BINARY_EXTENSIONS:
+        return False
+
+    stat = os.stat(path)
+    return _is_text_file(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_text_file(path: str, mtime_ns: int, size: int) -> bool:
+    with open(path, "rb") as fp:
+        return not fp.read(1024).translate(None, _TEXT_CHARS)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from collections.abc import Iterator
+from collections.abc import Mapping
+from collections.abc import Sequence
+from types import MappingProxyType
+from typing import Any
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover (no libyaml)
+    from yaml import SafeDumper  # type: ignore[assignment]
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+_SAFE_LOADERS = tuple({yaml.SafeLoader, SafeLoader})
+_SAFE_DUMPERS = tuple({yaml.SafeDumper, SafeDumper})
+
+
+def safe_load_all(stream: str) -> Iterator[Any]:
+    """Parse all YAML documents in a stream of model metadata."""
+    return yaml.load_all(stream, Loader=_MetadataLoader)
+
+
+def safe_dump(data: Any, **kwds: Any) -> str:
+    """Serialize model metadata as YAML."""
+    return yaml.dump(data, Dumper=_MetadataDumper, **kwds)
+
+
+def setup_yaml_with_canonical_dict() -> None:
+    """https://stackoverflow.com/a/8661021
+
+    Register the model metadata representers and float resolver with
+    PyYAML's global safe loaders and dumpers. This package no longer
+    calls this function itself; it is kept for those who rely on
+    ``yaml.safe_load`` and ``yaml.safe_dump`` behaving as they do for
+    model metadata.
+    """
+    for Dumper in _SAFE_DUMPERS:
+        _add_canonical_representers(Dumper)
+    for Loader in _SAFE_LOADERS:
+        _add_float_resolver(Loader)
+
+
+def _make_metadata_yaml(
+    Loader: type[Any], Dumper: type[Any]
+) -> tuple[type[Any], type[Any]]:
+    """Create a private Loader/Dumper pair for reading and writing metadata."""
+    MetadataLoader = type("MetadataLoader", (Loader,), {})
+    MetadataDumper = type("MetadataDumper", (Dumper,), {})
+
+    _add_float_resolver(MetadataLoader)
+    _add_canonical_representers(MetadataDumper)
+
+    return MetadataLoader, MetadataDumper
+
+
+def _add_canonical_representers(Dumper: Any) -> None:
+    yaml.add_representer(
+        OrderedDict,
+        lambda self, data: self.represent_mapping(
+            "tag:yaml.org,2002:map", data.items()
+        ),
+        Dumper=Dumper,
+    )
+
+    def repr_dict(self: Any, data: Mapping[str, Any]) -> Any:
+        return self.represent_mapping(
+            "tag:yaml.org,2002:map", sorted(data.items(), key=lambda t: t[0])
+        )
+
+    yaml.add_representer(dict, repr_dict, Dumper=Dumper)
+    yaml.add_representer(MappingProxyType, repr_dict, Dumper=Dumper)
+
+    # https://stackoverflow.com/a/45004464
+    def repr_str(dumper: Any, data: str) -> Any:
+        if "\n" in data:
+            return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
+        return dumper.represent_str(data)
+
+    yaml.add_representer(str, repr_str, Dumper=Dumper)
+
+    def repr_tuple(dumper: Any, data: Sequence[Any]) -> Any:
+        return dumper.represent_sequence("tag:yaml.org,2002:seq", list(data))
+
+    yaml.add_representer(tuple, repr_tuple, Dumper=Dumper)
+
+
+def _add_float_resolver(Loader: Any) -> None:
+    yaml.add_implicit_resolver(
+        "tag:yaml.org,2002:float",
+        re.compile(
+            r"""^(?:
+         [-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+]?[0-9]+)?
+        |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
+        |[-+]?\.[0-9_]+(?:[eE][-+]?[0-9]+)
+        |[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\.[0-9_]*
+        |[-+]?\.(?:inf|Inf|INF)
+        |\.(?:nan|NaN|NAN))$""",
+            re.X,
+        ),
+        list("-+0123456789."),
+        Loader=Loader,
+    )
+
+
+_MetadataLoader, _MetadataDumper = _make_metadata_yaml(SafeLoader, SafeDumper)
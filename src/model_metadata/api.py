@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import functools
+import os
 from collections.abc import Iterable
 from typing import Any
 
 from model_metadata.errors import UnknownKeyError
 from model_metadata.model_setup import FileSystemLoader
 from model_metadata.model_setup import OldFileSystemLoader
+from model_metadata.model_setup import StageManifest
+from model_metadata.modelmetadata import as_builtin
 from model_metadata.modelmetadata import ModelMetadata
+from model_metadata.parameter_table import SampleCheck
 
 
 def find(model: str | type) -> str:
@@ -49,10 +54,79 @@ def query(model: str, var: str) -> ModelMetadata:
     Returns
     -------
     object
-        The requested variable.
+        The requested variable. Sections are returned as new dicts and
+        lists, which the caller is free to change.
     """
     path_to_metadata = ModelMetadata.find(model)
-    return ModelMetadata(path_to_metadata).get(var)
+    return as_builtin(ModelMetadata.load(path_to_metadata).get(var))
+
+
+def query_many(model: str, vars: Iterable[str]) -> dict[str, Any]:
+    """Query metadata for several variables (or sections) at once.
+
+    The model's metadata is found and loaded only once and then each
+    variable is looked up in the same in-memory tree, so the cost of
+    each additional variable is just a lookup.
+
+    Parameters
+    ----------
+    model : path, str or object
+        The model is interpreted either as a path to a folder that
+        contains metadata, the name of a model component, or a
+        model object.
+    vars : iterable of str
+        Names of the variables to query, in "dotted notation".
+
+    Returns
+    -------
+    dict
+        The requested variables, keyed by name. As with :func:`query`,
+        sections are returned as new dicts and lists.
+
+    Raises
+    ------
+    MissingSectionError, MissingValueError
+        If any of the variables cannot be found.
+    """
+    path_to_metadata = ModelMetadata.find(model)
+    meta = ModelMetadata.load(path_to_metadata)
+    return {var: as_builtin(meta.get(var)) for var in vars}
+
+
+def check_samples(
+    model: str, samples: Any, names: Iterable[str] | None = None
+) -> SampleCheck:
+    """Check sampled sets of parameter values against a model's metadata.
+
+    Use this to reject samples (from a Latin hypercube design, for
+    instance) that are out of range before staging them. Requires *numpy*.
+
+    Parameters
+    ----------
+    model : path, str or object
+        The model is interpreted either as a path to a folder that
+        contains metadata, the name of a model component, or a
+        model object.
+    samples : array_like or mapping of array_like
+        Either a 2-D array with one row per sample and one column per
+        parameter, or 1-D arrays of equal length keyed by parameter name.
+    names : iterable of str, optional
+        For a 2-D array, the parameters of each of its columns. The
+        default is all of the model's parameters.
+
+    Returns
+    -------
+    SampleCheck
+        A mask of the valid samples and the number of invalid values of
+        each parameter.
+
+    See Also
+    --------
+    ParameterTable.check_samples
+    """
+    path_to_metadata = ModelMetadata.find(model)
+    table = ModelMetadata.load(path_to_metadata).parameter_table()
+    return table.check_samples(samples, names=names)
 
 
 def stage(
@@ -60,9 +134,16 @@ def stage(
     dest: str = ".",
     old_style_templates: bool = False,
     parameters: dict[str, Any] | None = None,
-) -> tuple[str, ...]:
+    incremental: bool = False,
+    link_mode: str = "copy",
+) -> StageManifest:
     """Stage a model by setting up its input files.
 
+    This function is thread-safe: it never changes the current working
+    directory and loaded metadata and templates are shared read-only, so
+    a model can be staged from many threads at once as long as each
+    thread stages into a different *dest*.
+
     Parameters
     ----------
     model : path, str or object
@@ -74,15 +155,159 @@ def stage(
     parameters : dict[str, Any], optional
         A dictionary of parameters that overrides the default
         values.
+    incremental : bool, optional
+        Only write files that are missing from *dest* or whose contents
+        have changed.
+    link_mode : {"copy", "hardlink", "symlink", "reflink"}, optional
+        How to stage the model's data files (files that are not
+        templates). Linking avoids copying large files; files that
+        can't be linked are copied.
+
+    Returns
+    -------
+    StageManifest
+        The staged files. Its *written* and *skipped* attributes
+        separate the files that were written from those that were
+        already up to date.
     """
     parameters = {} if parameters is None else parameters
 
-    defaults = {}
     mmd = ModelMetadata.find(model)
-    meta = ModelMetadata(mmd)
-    for param, item in meta.parameters.items():
-        defaults[param] = item["value"]["default"]
+    defaults = _default_parameters(ModelMetadata.load(mmd))
+    _validate_parameters(defaults, parameters)
+
+    return _loader(mmd, old_style_templates, incremental, link_mode).stage_all(
+        dest, **{**defaults, **parameters}
+    )
+
+
+def stage_many(
+    model: str,
+    parameters: Iterable[dict[str, Any]],
+    dest_pattern: str = "{index}",
+    old_style_templates: bool = False,
+    jobs: int = 1,
+    incremental: bool = False,
+    link_mode: str = "copy",
+) -> tuple[StageManifest, ...]:
+    """Stage an ensemble of a model, one folder per set of parameters.
+
+    The model's metadata and templates are loaded just once and every
+    set of parameters is validated before anything is staged.
+
+    Parameters
+    ----------
+    model : path, str or object
+        The model is interpreted either as a path to a folder that
+        contains metadata, the name of a model component, or a
+        model object.
+    parameters : iterable of dict
+        Sets of parameters, one for each ensemble member, that override
+        the default values.
+    dest_pattern : str, optional
+        Pattern for the folder within which to stage each member. It is
+        formatted with the member's *index* (counting from 0) and
+        its parameters, for example ``"run-{index:04d}"``. A parameter
+        called *index* doesn't override the member's index.
+    jobs : int, optional
+        Number of members to stage in parallel, in a pool of worker
+        processes.
+    incremental : bool, optional
+        Only write files that are missing or whose contents have changed.
+    link_mode : {"copy", "hardlink", "symlink", "reflink"}, optional
+        How to stage the model's data files.
+
+    Returns
+    -------
+    tuple of StageManifest
+        The manifest of staged files for each member. Each manifest's
+        *dest* attribute is the folder the member was staged into.
+
+    Raises
+    ------
+    UnknownKeyError
+        If any set of parameters contains a parameter that the model
+        does not have.
+    ValueError
+        If *dest_pattern* can't be formatted, or does not give a different
+        folder for each member.
+    """
+    parameters = list(parameters)
+
+    mmd = ModelMetadata.find(model)
+    defaults = _default_parameters(ModelMetadata.load(mmd))
+
+    members = []
+    for index, member in enumerate(parameters):
+        try:
+            _validate_parameters(defaults, member)
+        except UnknownKeyError as e:
+            e.add_note(f"ensemble member: {index}")
+            raise
+        members.append((_format_dest(dest_pattern, index, member), member))
+
+    if len({os.path.abspath(dest) for dest, _ in members}) < len(members):
+        raise ValueError(
+            f"{dest_pattern!r}: destination pattern must give a unique folder for"
+            " each ensemble member (include '{index}', for instance)"
+        )
 
+    if jobs <= 1 or len(members) <= 1:
+        loader = _loader(mmd, old_style_templates, incremental, link_mode)
+        return tuple(
+            loader.stage_all(dest, **{**defaults, **member}) for dest, member in members
+        )
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    stage_member = functools.partial(
+        _stage_member, mmd, old_style_templates, incremental, link_mode, defaults
+    )
+    with ProcessPoolExecutor(max_workers=min(jobs, len(members))) as executor:
+        return tuple(executor.map(stage_member, *zip(*members)))
+
+
+def _format_dest(dest_pattern: str, index: int, parameters: dict[str, Any]) -> str:
+    try:
+        return dest_pattern.format_map({**parameters, "index": index})
+    except (KeyError, IndexError, AttributeError, TypeError, ValueError) as err:
+        raise ValueError(
+            f"{dest_pattern!r}: unable to format destination pattern"
+            f" ({err.__class__.__name__}: {err})"
+        ) from err
+
+
+def _stage_member(
+    mmd: str,
+    old_style_templates: bool,
+    incremental: bool,
+    link_mode: str,
+    defaults: dict[str, Any],
+    dest: str,
+    parameters: dict[str, Any],
+) -> StageManifest:
+    return _loader(mmd, old_style_templates, incremental, link_mode).stage_all(
+        dest, **{**defaults, **parameters}
+    )
+
+
+def _loader(
+    mmd: str,
+    old_style_templates: bool,
+    incremental: bool = False,
+    link_mode: str = "copy",
+) -> OldFileSystemLoader | FileSystemLoader:
+    if old_style_templates:
+        return OldFileSystemLoader(mmd, incremental=incremental, link_mode=link_mode)
+    else:
+        return FileSystemLoader(mmd, incremental=incremental, link_mode=link_mode)
+
+
+def _default_parameters(meta: ModelMetadata) -> dict[str, Any]:
+    return {param: item["value"]["default"] for param, item in meta.parameters.items()}
+
+
+def _validate_parameters(defaults: dict[str, Any], parameters: dict[str, Any]) -> None:
     try:
         _check_for_unknown_keys(defaults.keys(), parameters.keys())
     except UnknownKeyError as e:
@@ -92,15 +317,6 @@ def stage(
         )
         raise
 
-    defaults = {**defaults, **parameters}
-
-    if old_style_templates:
-        manifest = OldFileSystemLoader(mmd).stage_all(dest, **defaults)
-    else:
-        manifest = FileSystemLoader(mmd).stage_all(dest, **defaults)
-
-    return manifest
-
 
 def _check_for_unknown_keys(allowed: Iterable[str], user: Iterable[str]) -> None:
     if unknown_keys := (set(user) - set(allowed)):
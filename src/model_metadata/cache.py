@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+from typing import NamedTuple
+
+from model_metadata._version import __version__
+from model_metadata.find import find_metadata_files
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def metadata_signature(path: str) -> tuple[tuple[str, int, int], ...]:
+    """Fingerprint the metadata files of a model.
+
+    Parameters
+    ----------
+    path : str
+        Path to the folder containing model metadata.
+
+    Returns
+    -------
+    tuple
+        The path, modification time (in ns) and size of each of the
+        metadata files, sorted by path.
+
+    Raises
+    ------
+    MetadataNotFoundError
+        If the folder does not contain any metadata files.
+    """
+    signature = []
+    for fname in _metadata_files(path):
+        stat = os.stat(fname)
+        signature.append((fname, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def metadata_digest(path: str) -> str:
+    """Hash the contents of the metadata files of a model.
+
+    Parameters
+    ----------
+    path : str
+        Path to the folder containing model metadata.
+
+    Returns
+    -------
+    str
+        Hex digest of the names and contents of the folder's metadata files.
+
+    Raises
+    ------
+    MetadataNotFoundError
+        If the folder does not contain any metadata files.
+    """
+    digest = hashlib.sha256()
+    for fname in _metadata_files(path):
+        digest.update(os.path.basename(fname).encode())
+        with open(fname, "rb") as fp:
+            digest.update(hashlib.sha256(fp.read()).digest())
+    return digest.hexdigest()
+
+
+def default_cache_dir() -> str:
+    """Path to the default folder for the on-disk metadata cache."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "model_metadata")
+
+
+def _metadata_files(path: str) -> list[str]:
+    files = set(find_metadata_files(path))
+    if os.path.isfile(meta_file := os.path.join(path, "meta.yaml")):
+        files.add(meta_file)
+    return sorted(files)
+
+
+class MetadataCache:
+    """A bounded, thread-safe, least-recently-used cache of loaded metadata.
+
+    Entries are keyed on the path to a metadata folder and are
+    invalidated whenever the modification time or size of any of the
+    folder's metadata files changes.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of entries to keep.
+
+    Examples
+    --------
+    >>> from model_metadata.cache import MetadataCache
+    >>> cache = MetadataCache(maxsize=8)
+    >>> cache.info()
+    CacheInfo(hits=0, misses=0, maxsize=8, currsize=0)
+    """
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be a positive integer ({maxsize!r})")
+        self._maxsize = maxsize
+        self._entries: OrderedDict[Any, tuple[Any, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self))
+
+    def clear(self) -> None:
+        """Remove all entries and reset the hit and miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = 0
+
+    def get(self, path: str, load: Callable[[str], Any]) -> Any:
+        """Get the metadata for a folder, loading it if necessary.
+
+        Parameters
+        ----------
+        path : str
+            Path to the folder containing model metadata.
+        load : callable
+            Function that loads the metadata from the folder when there
+            is no valid cached entry.
+
+        Returns
+        -------
+        object
+            The (possibly cached) result of ``load(path)``.
+        """
+        path = os.path.abspath(path)
+        key = (load, path)
+        signature = metadata_signature(path)
+
+        with self._lock:
+            try:
+                cached_signature, value = self._entries[key]
+            except KeyError:
+                pass
+            else:
+                if cached_signature == signature:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+            self._misses += 1
+
+        value = load(path)
+
+        with self._lock:
+            self._entries[key] = (signature, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache:
+    """A persistent cache of normalized metadata, stored as marshal files.
+
+    Entries are keyed on the absolute path to a metadata folder, a hash
+    of the contents of its metadata files and the version of this
+    package, so stale entries are never returned. A process that finds
+    an entry doesn't have to parse any YAML.
+
+    Values are serialized with :mod:`marshal`, which only handles
+    built-in types (dicts, tuples, strings, numbers, ...), so loading an
+    entry, unlike unpickling it, can't run arbitrary code. Writing a new
+    entry for a folder removes the folder's older entries.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Folder in which to store the cache. The default is
+        *model_metadata* under ``$XDG_CACHE_HOME`` (or *~/.cache*).
+    """
+
+    SUFFIX = ".marshal"
+
+    def __init__(self, directory: str | None = None):
+        self._directory = os.path.abspath(directory or default_cache_dir())
+
+    @classmethod
+    def from_env(cls) -> DiskCache | None:
+        """Create a cache from the ``MODEL_METADATA_DISK_CACHE`` variable.
+
+        If the variable is unset, empty or ``"0"`` the cache is disabled
+        and ``None`` is returned. A value of ``"1"`` uses the default cache
+        folder, any other value is used as the path to the cache folder.
+        """
+        value = os.environ.get("MODEL_METADATA_DISK_CACHE", "")
+        if value in ("", "0"):
+            return None
+        else:
+            return cls(None if value == "1" else value)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def key(self, path: str) -> str:
+        """Create the cache key for a metadata folder.
+
+        The key is made up of a hash of the folder's path and a hash of
+        the contents of its metadata files, separated by a dash.
+        """
+        folder = hashlib.sha256()
+        for part in (
+            __version__,
+            sys.implementation.cache_tag or "",
+            os.path.abspath(path),
+        ):
+            folder.update(part.encode())
+            folder.update(b"\0")
+        return f"{folder.hexdigest()[:32]}-{metadata_digest(path)[:32]}"
+
+    def get(self, key: str) -> Any | None:
+        """Get a cached value, or ``None`` if not found or unreadable."""
+        try:
+            with open(self._path_to(key), "rb") as fp:
+                return marshal.load(fp)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Add a value to the cache.
+
+        The file is written atomically and any other entries for the same
+        folder are removed. Failures to write the cache (a read-only
+        folder, for instance) are ignored, as are values that can't be
+        marshalled.
+        """
+        try:
+            data = marshal.dumps(value)
+        except ValueError:
+            return
+
+        with contextlib.suppress(OSError):
+            os.makedirs(self._directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fp:
+                    fp.write(data)
+                os.replace(tmp, self._path_to(key))
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp)
+                raise
+            self._prune(key)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._remove(lambda fname: fname.endswith(self.SUFFIX))
+
+    def _prune(self, key: str) -> None:
+        """Remove the entries for the same folder as *key*, other than *key*."""
+        prefix = key.partition("-")[0] + "-"
+        current = os.path.basename(self._path_to(key))
+        self._remove(
+            lambda fname: fname.startswith(prefix)
+            and fname.endswith(self.SUFFIX)
+            and fname != current
+        )
+
+    def _remove(self, match: Callable[[str], bool]) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            for fname in os.listdir(self._directory):
+                if match(fname):
+                    with contextlib.suppress(OSError):
+                        os.remove(os.path.join(self._directory, fname))
+
+    def _path_to(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}{self.SUFFIX}")
@@ -5,10 +5,10 @@ import os
 from collections.abc import Iterable
 from typing import Any
 
-import yaml
-
 
 def _load_yaml_file(file_like: io.TextIOBase | str) -> dict[str, Any]:
+    from model_metadata._yaml import safe_load_all
+
     if not isinstance(file_like, str):
         contents = file_like.read()
     elif os.path.isfile(file_like):
@@ -16,7 +16,7 @@ def _load_yaml_file(file_like: io.TextIOBase | str) -> dict[str, Any]:
             contents = fp.read()
     else:
         return {}
-    return _merge_documents(yaml.safe_load_all(contents))
+    return _merge_documents(safe_load_all(contents))
 
 
 def load_meta_section(path: str, section: str) -> dict[str, Any]:
@@ -44,6 +44,37 @@ def load_meta_section(path: str, section: str) -> dict[str, Any]:
     return meta_section
 
 
+def load_meta(path: str, sections: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """Load several sections from a model metadata folder in one pass.
+
+    The folder's *meta.yaml* file, if present, is read and parsed just
+    once. Section files (*api.yaml*, *info.yaml*, etc.) are only read
+    for sections that are not found in *meta.yaml*.
+
+    Parameters
+    ----------
+    path : str
+        Path to the folder containing model metadata.
+    sections : iterable of str
+        The names of the sections to load.
+
+    Returns
+    -------
+    dict
+        The metadata for each section, keyed by section name.
+    """
+    meta = _load_yaml_file(os.path.join(path, "meta.yaml"))
+
+    loaded = {}
+    for section in sections:
+        try:
+            loaded[section] = meta[section]
+        except KeyError:
+            loaded[section] = _load_yaml_file(os.path.join(path, f"{section}.yaml"))
+
+    return loaded
+
+
 def _merge_documents(documents: Iterable[dict[str, Any]]) -> dict[str, Any]:
     merged = {}
     for document in documents:
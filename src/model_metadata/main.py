@@ -3,22 +3,21 @@ from __future__ import annotations
 import argparse
 import os
 import sys
+from collections.abc import Callable
 from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
 from collections.abc import Sequence
 from functools import partial
 from typing import Any
 
-from model_metadata._utils import load_component
 from model_metadata._utils import parse_entry_point
 from model_metadata._version import __version__
-from model_metadata.api import find as _find
-from model_metadata.api import query as _query
-from model_metadata.api import stage as _stage
 from model_metadata.errors import BadEntryPointError
 from model_metadata.errors import MetadataNotFoundError
 from model_metadata.errors import MissingSectionError
 from model_metadata.errors import MissingValueError
-from model_metadata.modelmetadata import ModelMetadata
+from model_metadata.errors import UnknownKeyError
 
 
 out = partial(print, file=sys.stderr)
@@ -40,16 +39,25 @@ class ValidateEntryPoint(argparse.Action):
         values: str | Sequence[Any] | None,
         option_string: str | None = None,
     ) -> None:
-        if not isinstance(values, str):
+        if isinstance(values, str):
+            setattr(namespace, self.dest, self._validate(parser, values))
+        elif isinstance(values, Sequence):
+            setattr(
+                namespace,
+                self.dest,
+                [self._validate(parser, value) for value in values],
+            )
+        else:
             parser.error(f"{values}: invalid entry-point: not a string")
 
-        entry_point = values
+    @staticmethod
+    def _validate(parser: argparse.ArgumentParser, entry_point: Any) -> tuple[str, str]:
+        if not isinstance(entry_point, str):
+            parser.error(f"{entry_point}: invalid entry-point: not a string")
         try:
-            module_name, class_name = parse_entry_point(entry_point)
+            return parse_entry_point(entry_point)
         except BadEntryPointError as error:
             parser.error(f"{entry_point}: invalid entry-point: {str(error)}")
-        else:
-            setattr(namespace, self.dest, (module_name, class_name))
 
 
 class ValidatePathExists(argparse.Action):
@@ -60,15 +68,24 @@ class ValidatePathExists(argparse.Action):
         values: str | Sequence[Any] | None,
         option_string: str | None = None,
     ) -> None:
-        if not isinstance(values, str):
+        if isinstance(values, str):
+            setattr(namespace, self.dest, self._validate(parser, values))
+        elif isinstance(values, Sequence):
+            setattr(
+                namespace,
+                self.dest,
+                [self._validate(parser, value) for value in values],
+            )
+        else:
             parser.error(f"{values}: invalid path: not a string")
 
-        path = values
-
+    @staticmethod
+    def _validate(parser: argparse.ArgumentParser, path: Any) -> str:
+        if not isinstance(path, str):
+            parser.error(f"{path}: invalid path: not a string")
         if not os.path.isdir(path):
             parser.error(f"{path}: path does not exist")
-        else:
-            setattr(namespace, self.dest, path)
+        return path
 
 
 def main(argv: tuple[str, ...] | None = None) -> int:
@@ -91,12 +108,29 @@ def main(argv: tuple[str, ...] | None = None) -> int:
         )
         return parser
 
+    def _add_many_options(parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            help="Number of models to process in parallel.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=("yaml", "json"),
+            default="yaml",
+            help="Output format: YAML documents or JSON lines.",
+        )
+
     find_parser = _add_cmd("find", help="find the metadata for a model")
-    find_parser.add_argument("entry_point", action=ValidateEntryPoint)
+    find_parser.add_argument("entry_point", nargs="+", action=ValidateEntryPoint)
+    _add_many_options(find_parser)
     find_parser.set_defaults(func=find)
 
     query_parser = _add_cmd("query", help="print metadata about a model")
-    query_parser.add_argument("metadata", action=ValidatePathExists)
+    query_parser.add_argument("metadata", nargs="+", action=ValidatePathExists)
+    _add_many_options(query_parser)
     query_parser.set_defaults(func=query)
     vars_group = query_parser.add_mutually_exclusive_group()
     vars_group.add_argument("--var", nargs="*")
@@ -104,9 +138,58 @@ def main(argv: tuple[str, ...] | None = None) -> int:
 
     stage_parser = _add_cmd("stage", help="stage a model's input files")
     stage_parser.add_argument("metadata", action=ValidatePathExists)
-    stage_parser.add_argument("dest")
+    stage_parser.add_argument(
+        "dest",
+        help=(
+            "Folder in which to stage the model. With --ensemble, a pattern"
+            " formatted with each member's index, e.g. 'run-{index:03d}'."
+        ),
+    )
+    stage_parser.add_argument(
+        "--ensemble",
+        metavar="CSV",
+        help="Stage one member per row of a CSV file of parameter values.",
+    )
+    stage_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of ensemble members to stage in parallel.",
+    )
+    stage_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only write files that are missing or have changed.",
+    )
+    stage_parser.add_argument(
+        "--link-mode",
+        choices=("copy", "hardlink", "symlink", "reflink"),
+        default="copy",
+        help="How to stage data files that are not templates (default: copy).",
+    )
     stage_parser.set_defaults(func=stage)
 
+    index_parser = _add_cmd("index", help="build an index of installed models")
+    index_parser.add_argument(
+        "--sharedir", help="folder of installed model metadata to index"
+    )
+    index_parser.add_argument(
+        "--entry-point",
+        action="append",
+        default=[],
+        dest="entry_points",
+        help="entry point of a model to add to the index",
+    )
+    index_parser.add_argument(
+        "--group", help="add all models from an entry-point group to the index"
+    )
+    index_parser.add_argument("--output", help="path to the index file")
+    index_parser.add_argument(
+        "--list", action="store_true", help="list the models in an existing index"
+    )
+    index_parser.set_defaults(func=index)
+
     args = parser.parse_args(argv)
     try:
         return args.func(args)
@@ -116,30 +199,33 @@ def main(argv: tuple[str, ...] | None = None) -> int:
 
 
 def find(args: argparse.Namespace) -> int:
-    if args.verbose and not args.silent:
-        out(
-            f"attemting to import {args.entry_point[1]} from {args.entry_point[0]}",
-            file=sys.stderr,
-        )
-
-    try:
-        cls = load_component(*args.entry_point)
-    except ImportError as err:
-        raise FatalError(str(err))
-    except ModuleNotFoundError as err:
-        raise FatalError(str(err))
+    entry_points = [":".join(entry_point) for entry_point in args.entry_point]
 
     if args.verbose and not args.silent:
-        out(f"looking for metadata for {cls.__name__}")
-    try:
-        print(str(_find(cls)))
-    except MetadataNotFoundError as err:
-        FatalError(str(err))
+        out(f"looking for metadata for {', '.join(entry_points)}")
+
+    if len(entry_points) == 1 and args.format == "yaml":
+        path, error = _find_one(entry_points[0])
+        if error:
+            raise FatalError(error)
+        print(path)
+        return 0
+
+    n_errors = 0
+    for entry_point, (path, error) in _map_models(_find_one, entry_points, args.jobs):
+        if error:
+            n_errors += 1
+            if not args.silent:
+                out(error)
+        else:
+            _print_record({"model": entry_point, "path": path}, args.format)
 
-    return 0
+    return n_errors
 
 
 def query(args: argparse.Namespace) -> int:
+    from model_metadata.modelmetadata import ModelMetadata
+
     if args.all:
         vars: Iterable[str] = ModelMetadata.SECTIONS
     else:
@@ -148,35 +234,159 @@ def query(args: argparse.Namespace) -> int:
     if not vars and not args.silent:
         out("nothing to query")
 
-    values, errors = {}, {}
+    if len(args.metadata) == 1 and args.format == "yaml":
+        values, errors = _query_one(args.metadata[0], tuple(vars))
+
+        if errors and not args.silent:
+            for error in errors:
+                out(error)
+        if values:
+            print(ModelMetadata.format(values))
+
+        return len(errors)
+
+    n_errors = 0
+    for path, (values, errors) in _map_models(
+        partial(_query_one, vars=tuple(vars)), args.metadata, args.jobs
+    ):
+        n_errors += len(errors)
+        if errors and not args.silent:
+            for error in errors:
+                out(f"{path}: {error}")
+        _print_record({"model": path, "values": values}, args.format)
+
+    return n_errors
+
+
+def _find_one(entry_point: str) -> tuple[str | None, str | None]:
+    from model_metadata.api import find as _find
+
+    try:
+        return str(_find(entry_point)), None
+    except (ImportError, MetadataNotFoundError) as err:
+        return None, str(err)
+    except Exception as err:
+        return None, f"{entry_point}: {_describe_error(err)}"
+
+
+def _query_one(path: str, vars: tuple[str, ...]) -> tuple[dict[str, Any], list[str]]:
+    from model_metadata.api import find as _find
+    from model_metadata.modelmetadata import as_builtin
+    from model_metadata.modelmetadata import ModelMetadata
+
+    values: dict[str, Any] = {}
+    errors: list[str] = []
+    if vars:
+        try:
+            meta = ModelMetadata.load(_find(path))
+        except MetadataNotFoundError as err:
+            return values, [f"{err}: Metadata not found"]
+        except Exception as err:
+            return values, [_describe_error(err)]
     for name in vars:
         try:
-            value = _query(args.metadata, name)
+            values[name] = as_builtin(meta.get(name))
         except MissingSectionError as err:
-            errors[name] = f"{err.name}: Missing section"
+            errors.append(f"{err.name}: Missing section")
         except MissingValueError as err:
-            errors[name] = f"{err.name}: Missing value"
-        else:
-            values[name] = value
+            errors.append(f"{err.name}: Missing value")
+
+    return values, errors
+
+
+def _describe_error(err: Exception) -> str:
+    return f"{err.__class__.__name__}: {err}" if str(err) else err.__class__.__name__
+
+
+def _map_models(
+    func: Callable[[str], Any], models: Sequence[str], jobs: int = 1
+) -> Iterator[tuple[str, Any]]:
+    """Apply a function to models, yielding results as they finish.
 
-    if errors and not args.silent:
-        for error in errors.values():
-            out(error)
-    if values:
-        print(ModelMetadata.format(values))
+    If *jobs* is greater than one, models are processed concurrently in
+    a pool of worker processes.
+    """
+    if jobs <= 1 or len(models) <= 1:
+        for model in models:
+            yield model, func(model)
+        return
 
-    return len(errors)
+    from concurrent.futures import as_completed
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(models))) as executor:
+        futures = {executor.submit(func, model): model for model in models}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def _print_record(record: dict[str, Any], format: str) -> None:
+    if format == "json":
+        import json
+
+        print(json.dumps(record, default=str), flush=True)
+    else:
+        from model_metadata._yaml import safe_dump
+
+        print(safe_dump(record, explicit_start=True), end="", flush=True)
 
 
 def stage(args: argparse.Namespace) -> int:
+    from model_metadata.api import stage as _stage
+    from model_metadata.api import stage_many as _stage_many
+
+    if args.ensemble:
+        from model_metadata.modelmetadata import ModelMetadata
+
+        try:
+            meta = ModelMetadata.load(ModelMetadata.find(args.metadata))
+        except MetadataNotFoundError as err:
+            out(str(err))
+            return 1
+
+        try:
+            ensemble = _read_ensemble(args.ensemble, meta.parameters)
+        except (OSError, ValueError) as err:
+            raise FatalError(f"{args.ensemble}: unable to read ensemble ({err})")
+
+        try:
+            manifests = _stage_many(
+                args.metadata,
+                ensemble,
+                dest_pattern=args.dest,
+                jobs=args.jobs,
+                incremental=args.incremental,
+                link_mode=args.link_mode,
+            )
+        except MetadataNotFoundError as err:
+            out(str(err))
+            return 1
+        except (UnknownKeyError, ValueError) as err:
+            raise FatalError(str(err))
+
+        if args.verbose and not args.silent:
+            out(f"staged {len(manifests)} ensemble members")
+        for manifest in manifests:
+            for fname in manifest:
+                print(os.path.join(manifest.dest, fname))
+
+        return 0
+
     try:
-        manifest = _stage(args.metadata, dest=args.dest)
+        manifest = _stage(
+            args.metadata,
+            dest=args.dest,
+            incremental=args.incremental,
+            link_mode=args.link_mode,
+        )
     except MetadataNotFoundError as err:
         out(str(err))
         return 1
 
     if args.verbose and not args.silent:
         out(f"staged files in: {os.path.realpath(args.dest)}")
+        if args.incremental:
+            out(f"skipped {len(manifest.skipped)} unchanged files")
     if not manifest and not args.silent:
         out("no files to stage")
 
@@ -185,5 +395,75 @@ def stage(args: argparse.Namespace) -> int:
     return 0
 
 
+def _read_ensemble(path: str, parameters: Mapping[str, Any]) -> list[dict[str, Any]]:
+    """Read sets of parameters from a CSV file, one set per row.
+
+    The first row gives parameter names. Each value is converted to the
+    type of its parameter; values of string, choice and file parameters
+    (and of parameters the model doesn't have) are left as strings. Empty
+    cells are left out of the set so those parameters keep their default
+    values.
+    """
+    import csv
+
+    ensemble = []
+    with open(path, newline="") as fp:
+        reader = csv.DictReader(fp)
+        for row in reader:
+            member = {}
+            for name, value in row.items():
+                if value == "":
+                    continue
+                try:
+                    member[name] = _parse_value(value, parameters.get(name))
+                except ValueError as err:
+                    raise ValueError(
+                        f"line {reader.line_num}, column {name!r}: {err}"
+                    ) from err
+            ensemble.append(member)
+    return ensemble
+
+
+def _parse_value(value: str, parameter: Mapping[str, Any] | None) -> Any:
+    if parameter is None:
+        return value
+
+    dtype = parameter["value"]["type"]
+    if dtype == "int":
+        return int(value)
+    elif dtype == "float":
+        return float(value)
+    elif dtype == "bool":
+        for choice in parameter["value"]["choices"]:
+            if value.lower() == str(choice).lower():
+                return choice
+        raise ValueError(f"{value!r}: not a valid boolean")
+    else:
+        return value
+
+
+def index(args: argparse.Namespace) -> int:
+    from model_metadata.registry import build_index
+    from model_metadata.registry import load_index
+    from model_metadata.registry import write_index
+
+    if args.list:
+        models = load_index(args.output)["models"]
+        for path, model in sorted(models.items(), key=lambda item: item[1]["name"]):
+            print(f"{model['name']}: {path}")
+        return 0
+
+    new_index = build_index(
+        sharedir=args.sharedir, entry_points=args.entry_points, group=args.group
+    )
+    path_to_index = write_index(new_index, args.output)
+
+    if args.verbose and not args.silent:
+        out(f"indexed {len(new_index['models'])} models")
+    print(path_to_index)
+
+    return 0
+
+
 if __name__ == "__main__":
     SystemExit(main())
@@ -1,10 +1,18 @@
 #! /usr/bin/env python
 from __future__ import annotations
 
+import contextlib
 import io
 import os
+import re
 import string
 import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Hashable
+from collections.abc import Iterable
+from collections.abc import Iterator
 from collections.abc import Mapping
 from collections.abc import Sequence
 from typing import Any
@@ -28,9 +36,110 @@ class SafeFormatter(string.Formatter):
             return value
 
 
+_Segment = tuple[str, str | None, str | None, "str | list[_Segment]"]
+
+# Estimated size, in bytes, of each of the segments of a compiled template
+_SEGMENT_NBYTES = 200
+
+
+class CompiledTemplate:
+    """A format string that is parsed once and can be rendered many times.
+
+    The template is split into literal text and replacement fields when
+    it is created, so rendering only has to look up, convert and format
+    the value of each field. Rendering gives exactly the same result
+    as formatting the template with :class:`SafeFormatter`.
+
+    Parameters
+    ----------
+    template : str
+        A format string.
+
+    Examples
+    --------
+    >>> from model_metadata.model_data_files import CompiledTemplate
+    >>> template = CompiledTemplate("{run_duration:.1f} {not_a_param}")
+    >>> template.render(run_duration=100)
+    '100.0 {not_a_param}'
+    """
+
+    _formatter = SafeFormatter()
+
+    def __init__(self, template: str):
+        self._template = template
+        try:
+            self._segments: list[_Segment] | None = self._compile(template, 2)
+        except ValueError:
+            self._segments = None
+
+    @property
+    def template(self) -> str:
+        return self._template
+
+    @property
+    def nbytes(self) -> int:
+        """Rough estimate of the memory used by the compiled template."""
+        n_segments = 0 if self._segments is None else len(self._segments)
+        return 2 * len(self._template) + _SEGMENT_NBYTES * n_segments
+
+    def render(self, **kwds: dict[str, Any]) -> str:
+        if self._segments is None:
+            return self._formatter.format(self._template, **kwds)
+        else:
+            return self._render(self._segments, kwds)
+
+    @classmethod
+    def _compile(cls, format_string: str, recursion_depth: int) -> list[_Segment]:
+        """Parse a format string as :meth:`string.Formatter.vformat` does.
+
+        Templates that use positional fields or nest fields too deeply
+        raise a ``ValueError``, in which case they are left to be
+        rendered by the formatter itself.
+        """
+        if recursion_depth < 0:
+            raise ValueError("Max string recursion exceeded")
+
+        segments: list[_Segment] = []
+        for literal, field_name, spec, conversion in cls._formatter.parse(
+            format_string
+        ):
+            if field_name is None:
+                segments.append((literal, None, None, ""))
+                continue
+            if field_name == "" or field_name.isdigit():
+                raise ValueError("positional fields are not supported")
+
+            compiled_spec = cls._compile(spec or "", recursion_depth - 1)
+            if all(name is None for _, name, _, _ in compiled_spec):
+                segments.append((literal, field_name, conversion, spec or ""))
+            else:
+                segments.append((literal, field_name, conversion, compiled_spec))
+        return segments
+
+    def _render(self, segments: list[_Segment], kwds: Mapping[str, Any]) -> str:
+        get_field = self._formatter.get_field
+        convert_field = self._formatter.convert_field
+        format_field = self._formatter.format_field
+
+        result = []
+        for literal, field_name, conversion, spec in segments:
+            if literal:
+                result.append(literal)
+            if field_name is not None:
+                obj = convert_field(get_field(field_name, (), kwds)[0], conversion)
+                if not isinstance(spec, str):
+                    spec = self._render(spec, kwds)
+                result.append(format_field(obj, spec))
+        return "".join(result)
+
+
 class FileTemplate:
     _formatter = SafeFormatter()
 
+    # Templates up to this size (in bytes) are compiled and cached,
+    # larger ones are streamed.
+    MAX_COMPILED_SIZE = 2**20
+
     def __init__(self, path: str):
         self._path = os.path.abspath(path)
         self._head, self._tail = os.path.split(self._path)
@@ -44,9 +153,29 @@ class FileTemplate:
         return self._tail
 
     def render(self, **kwds: dict[str, Any]) -> str:
-        with open(self.path) as fp:
-            template = fp.read()
-        return self._formatter.format(template, **kwds)
+        return "".join(self.stream(**kwds))
+
+    def stream(self, **kwds: dict[str, Any]) -> Iterator[str]:
+        """Render the template in chunks.
+
+        Small templates are compiled once, and then cached until the
+        file changes. Larger templates are read and rendered a chunk at a
+        time so that memory use doesn't depend on the size of the template.
+
+        This applies only to these (old-style) templates. New-style, Jinja,
+        templates staged by :class:`~model_metadata.model_setup.FileSystemLoader`
+        are compiled from the entire template in memory; only their
+        output is streamed.
+        """
+        stat = os.stat(self.path)
+        if stat.st_size <= self.MAX_COMPILED_SIZE:
+            yield _compile_file(self.path, stat.st_mtime_ns, stat.st_size).render(
+                **kwds
+            )
+        else:
+            with open(self.path) as fp:
+                for chunk in iter_template_chunks(fp):
+                    yield self._formatter.format(chunk, **kwds)
 
     def to_file(self, dest: str, **kwds: dict[str, Any]) -> str:
         if dest.endswith(os.path.sep):
@@ -58,7 +187,7 @@ class FileTemplate:
             dest = base
 
         with open(dest, "w") as fp:
-            fp.write(self.render(**kwds))
+            fp.writelines(self.stream(**kwds))
 
         return dest
 
@@ -108,13 +237,130 @@ def format_template_file(src: str, dest: str, **kwds: dict[str, Any]) -> None:
     if ext == ".tmpl":
         dest = base
 
-    with open(src) as fp:
-        template = fp.read()
-
     with open(dest, "w") as fp:
-        fp.write(sub_parameters(template, **kwds))
+        fp.writelines(FileTemplate(src).stream(**kwds))
 
 
 def sub_parameters(string: str, **kwds: dict[str, Any]) -> str:
-    formatter = SafeFormatter()
-    return formatter.format(string, **kwds)
+    if len(string) > FileTemplate.MAX_COMPILED_SIZE:
+        return CompiledTemplate._formatter.format(string, **kwds)
+    return _compiled.get(string, lambda: CompiledTemplate(string)).render(**kwds)
+
+
+def _compile_file(path: str, mtime_ns: int, size: int) -> CompiledTemplate:
+    def _compile() -> CompiledTemplate:
+        with open(path) as fp:
+            return CompiledTemplate(fp.read())
+
+    return _compiled.get((path, mtime_ns, size), _compile)
+
+
+class _CompiledTemplateCache:
+    """A least-recently-used cache of compiled templates.
+
+    The cache is bounded by the estimated size of the compiled templates
+    it holds rather than by their number, so a few large templates can't
+    pin down an unbounded amount of memory.
+    """
+
+    def __init__(self, max_nbytes: int):
+        self._max_nbytes = max_nbytes
+        self._nbytes = 0
+        self._entries: OrderedDict[Hashable, CompiledTemplate] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def get(
+        self, key: Hashable, compile: Callable[[], CompiledTemplate]
+    ) -> CompiledTemplate:
+        with self._lock, contextlib.suppress(KeyError):
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        template = compile()
+        if template.nbytes > self._max_nbytes:
+            return template
+
+        with self._lock:
+            if (old := self._entries.pop(key, None)) is not None:
+                self._nbytes -= old.nbytes
+            self._entries[key] = template
+            self._nbytes += template.nbytes
+            while self._nbytes > self._max_nbytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+        return template
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_compiled = _CompiledTemplateCache(max_nbytes=2**25)
+
+
+_BRACE = re.compile("[{}]")
+
+
+def iter_template_chunks(
+    lines: Iterable[str], chunk_size: int = 65536
+) -> Iterator[str]:
+    """Split a template into chunks that can be formatted separately.
+
+    Lines are joined into chunks of at least *chunk_size* characters
+    (except for the last one), breaking only between lines that are not
+    within a replacement field. Formatting each of the chunks and joining
+    them gives the same result as formatting the entire template.
+
+    Parameters
+    ----------
+    lines : iterable of str
+        Lines of the template, as read from a file.
+    chunk_size : int, optional
+        Target size of each chunk, in characters.
+
+    Yields
+    ------
+    str
+        The next chunk of the template.
+    """
+    chunk: list[str] = []
+    size = 0
+    depth = 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line)
+        if "{" in line or "}" in line:
+            depth = _field_depth(line, depth)
+        if depth == 0 and size >= chunk_size:
+            yield "".join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield "".join(chunk)
+
+
+def _field_depth(line: str, depth: int) -> int:
+    """Track how deeply nested a line ends within replacement fields.
+
+    Outside of a field, doubled braces are escaped literals. Within a
+    field, as with :meth:`string.Formatter.parse`, every brace counts.
+    """
+    pos = 0
+    while match := _BRACE.search(line, pos):
+        brace = match.group()
+        pos = match.end()
+        if depth:
+            depth += 1 if brace == "{" else -1
+        elif line.startswith(brace, pos):
+            pos += 1
+        elif brace == "{":
+            depth = 1
+    return depth
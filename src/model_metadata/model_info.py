@@ -8,13 +8,7 @@ from collections.abc import Iterable
 from pprint import pformat
 from typing import Any
 
-import yaml
 from model_metadata.load import load_meta_section
-from model_metadata.model_parameter import setup_yaml_with_canonical_dict
-from packaging.version import InvalidVersion
-from packaging.version import Version
-
-setup_yaml_with_canonical_dict()
 
 
 EMAIL_REGEX = r"(^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$)"
@@ -117,6 +111,9 @@ def validate_doi(doi: str) -> str:
 
 def validate_version(version: str) -> str:
     """Validate a version string."""
+    from packaging.version import InvalidVersion
+    from packaging.version import Version
+
     try:
         Version(version)
     except InvalidVersion:
@@ -225,10 +222,12 @@ class ModelInfo:
         return ModelInfo(params.pop("name", "?"), **params).as_dict()
 
     def to_yaml(self) -> str:
+        from model_metadata._yaml import safe_dump
+
         d = self.as_dict()
         d["authors"] = d.get("authors", ())
         d["cite_as"] = d.get("cite_as", ())
-        return yaml.safe_dump(d, default_flow_style=False)
+        return safe_dump(d, default_flow_style=False)
 
     def __str__(self) -> str:
         return pformat(object_properties(self))
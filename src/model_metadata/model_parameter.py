@@ -4,14 +4,18 @@ from __future__ import annotations
 import contextlib
 import sys
 import warnings
+from collections.abc import Iterable
+from collections.abc import Mapping
 from collections.abc import Sequence
+from types import ModuleType
 from typing import Any
 
-import yaml
-from model_metadata._utils import setup_yaml_with_canonical_dict
 
+def setup_yaml_with_canonical_dict() -> None:
+    """Register the model metadata YAML representers and resolvers globally."""
+    from model_metadata._yaml import setup_yaml_with_canonical_dict
 
-setup_yaml_with_canonical_dict()
+    setup_yaml_with_canonical_dict()
 
 
 def infer_range(
@@ -133,14 +137,38 @@ def infer_type(value: float | str) -> str:
         raise ValueError("unable to infer data type")
 
 
-def parameter_from_dict(d: dict[str, Any]) -> ModelParameter:
+def parameter_from_dict(d: Mapping[str, Any]) -> ModelParameter:
+    """Create a parameter from its metadata.
+
+    The metadata are only read, never modified, so they can be shared
+    (with other threads, or a cache) without being copied first.
+
+    Parameters
+    ----------
+    d : mapping
+        The parameter's metadata, as found in a parameters section.
+
+    Returns
+    -------
+    ModelParameter
+        The parameter.
+
+    Examples
+    --------
+    >>> from model_metadata.model_parameter import parameter_from_dict
+    >>> d = {"value": {"default": 1.0, "type": "float", "units": "m"}}
+    >>> param = parameter_from_dict(d)
+    >>> param.value, param.units
+    (1.0, 'm')
+    >>> d
+    {'value': {'default': 1.0, 'type': 'float', 'units': 'm'}}
+    """
     kwds: dict[str, Any] = {"desc": d.get("description") or d.get("desc")}
 
     value = d["value"]
-    if isinstance(value, dict):
-        # value = d["value"]["default"]
-        value = d["value"].pop("default")
-        kwds.update(d["value"])
+    if isinstance(value, Mapping):
+        kwds.update((key, val) for key, val in value.items() if key != "default")
+        value = value["default"]
         if "choices" in kwds:
             kwds.setdefault("type", "choice")
         elif "files" in kwds:
@@ -148,7 +176,7 @@ def parameter_from_dict(d: dict[str, Any]) -> ModelParameter:
         elif "true_value" in kwds or "false_value" in kwds:
             kwds.setdefault("type", "bool")
 
-    if "range" in kwds and isinstance(kwds["range"], dict):
+    if "range" in kwds and isinstance(kwds["range"], Mapping):
         kwds["range"] = (kwds["range"]["min"], kwds["range"]["max"])
 
     # dtype = kwds.get("type") or infer_type(value)
@@ -170,13 +198,242 @@ def parameter_from_dict(d: dict[str, Any]) -> ModelParameter:
         raise ValueError(f"{dtype}: unknown parameter type")
 
 
+def normalize_parameters(params: Mapping[str, Any]) -> dict[str, dict[str, Any]]:
+    """Validate and normalize all of the parameters of a parameters section.
+
+    This gives the same result as calling :func:`parameter_from_dict`,
+    and then ``as_dict``, for each of the parameters but without creating
+    a parameter object for each one. Common parameter types (numbers,
+    choices and strings) are normalized directly and the bounds of all
+    numeric parameters are then checked together, with NumPy if it is
+    installed. Anything else goes through :func:`parameter_from_dict`.
+
+    Parameters
+    ----------
+    params : mapping
+        The parameters, keyed by name.
+
+    Returns
+    -------
+    dict
+        The normalized parameters.
+
+    Raises
+    ------
+    ValueError
+        If a parameter is not valid. The message names the first such
+        parameter.
+
+    Examples
+    --------
+    >>> from model_metadata.model_parameter import normalize_parameters
+    >>> normed = normalize_parameters(
+    ...     {"dt": {"description": "Time step", "value": {"default": 1, "type": "float"}}}
+    ... )
+    >>> normed["dt"]["value"]
+    {'default': 1.0, 'type': 'float'}
+    """
+    normed: dict[str, dict[str, Any]] = {}
+    bounded: list[tuple[str, float, float | None, float | None]] = []
+    error: tuple[str, ValueError] | None = None
+
+    for name, d in params.items():
+        try:
+            if (fast := _normalize_parameter(d)) is None:
+                normed[name] = parameter_from_dict(d).as_dict()
+            else:
+                normed[name], bounds = fast
+                if bounds is not None:
+                    bounded.append((name, *bounds))
+        except ValueError as err:
+            error = (name, err)
+            break
+
+    if (out_of_bounds := _check_bounds(bounded)) is not None:
+        error = out_of_bounds
+
+    if error is not None:
+        name, cause = error
+        raise ValueError(f"{name}: unable to load parameter ({cause})") from cause
+
+    return normed
+
+
+_NUMBER_TYPES = {
+    "float": "float",
+    "double": "float",
+    "int": "int",
+    "integer": "int",
+    "long": "int",
+}
+_NUMBER_KEYS = frozenset(("default", "type", "units", "range"))
+_CHOICE_KEYS = frozenset(("default", "type", "choices"))
+_STRING_KEYS = frozenset(("default", "type"))
+
+# Numbers of this size or smaller are exactly representable as doubles
+_MAX_EXACT_INT = 2**53
+
+# Use NumPy to check bounds only if there are at least this many
+_MIN_VECTORIZED_SIZE = 64
+
+
+def _normalize_parameter(
+    d: Any,
+) -> tuple[dict[str, Any], tuple[float, float | None, float | None] | None] | None:
+    """Normalize a parameter without creating a parameter object.
+
+    Returns the normalized parameter and, for numbers, the value and
+    bounds still to be checked. ``None`` means the parameter is not one of
+    the simple cases and should be loaded with :func:`parameter_from_dict`.
+    """
+    if not isinstance(d, Mapping) or not isinstance(value := d.get("value"), Mapping):
+        return None
+    if "default" not in value:
+        return None
+
+    default = value["default"]
+    desc = d.get("description") or d.get("desc")
+
+    if (dtype := value.get("type")) is None:
+        if "choices" in value:
+            dtype = "choice"
+        elif type(default) is float:
+            dtype = "float"
+        elif type(default) is int:
+            dtype = "int"
+        else:
+            return None
+
+    if dtype in _NUMBER_TYPES and value.keys() <= _NUMBER_KEYS:
+        dtype = _NUMBER_TYPES[dtype]
+        if not _is_number(default) or (dtype == "int" and type(default) is not int):
+            return None
+
+        range_ = value.get("range")
+        if range_ is None:
+            bounds: tuple[Any, Any] = (None, None)
+        elif isinstance(range_, Mapping) and "min" in range_ and "max" in range_:
+            bounds = (range_["min"], range_["max"])
+        elif isinstance(range_, (list, tuple)) and len(range_) == 2:
+            bounds = (range_[0], range_[1])
+        else:
+            return None
+        if not all(bound is None or _is_number(bound) for bound in bounds):
+            return None
+
+        number = float(default) if dtype == "float" else default
+        normed: dict[str, Any] = {"default": number, "type": dtype}
+        if (units := value.get("units")) is not None:
+            normed["units"] = units
+        if bounds[0] is not None or bounds[1] is not None:
+            normed["range"] = limits = {}
+            if bounds[0] is not None:
+                limits["min"] = bounds[0]
+            if bounds[1] is not None:
+                limits["max"] = bounds[1]
+
+        return {"description": desc, "value": normed}, (number, *bounds)
+
+    elif dtype == "choice" and value.keys() <= _CHOICE_KEYS:
+        if not isinstance(choices := value.get("choices"), (list, tuple)):
+            return None
+        if default not in choices:
+            raise ValueError("value is not contained in choices")
+
+        return {
+            "description": desc,
+            "value": {"default": default, "type": "str", "choices": tuple(choices)},
+        }, None
+
+    elif dtype in ("str", "string") and value.keys() <= _STRING_KEYS:
+        return {
+            "description": desc,
+            "value": {"default": str(default), "type": "str"},
+        }, None
+
+    return None
+
+
+def _is_number(value: Any) -> bool:
+    return type(value) is float or (
+        type(value) is int and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT
+    )
+
+
+def _check_bounds(
+    bounded: Sequence[tuple[str, float, float | None, float | None]],
+) -> tuple[str, ValueError] | None:
+    """Find the first of a set of numbers that is out of bounds."""
+    numpy = _import_numpy() if len(bounded) >= _MIN_VECTORIZED_SIZE else None
+
+    if numpy is None:
+        candidates: Iterable[int] = range(len(bounded))
+    else:
+        _, values, lower, upper = zip(*bounded)
+        values = numpy.array(values, dtype=float)
+        lower = numpy.array(
+            [-numpy.inf if bound is None else bound for bound in lower], dtype=float
+        )
+        upper = numpy.array(
+            [numpy.inf if bound is None else bound for bound in upper], dtype=float
+        )
+        candidates = numpy.flatnonzero((values < lower) | (values > upper)).tolist()
+
+    for index in candidates:
+        name, number, min_val, max_val = bounded[index]
+        try:
+            assert_in_bounds(number, (min_val, max_val))
+        except ValueError as error:
+            return name, error
+    return None
+
+
+def _import_numpy() -> ModuleType | None:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    else:
+        return numpy
+
+
 class ModelParameter:
-    _kwds: tuple[str, ...] | tuple[()] = ()
+    """A model parameter.
+
+    Parameter objects are compact (they use ``__slots__``) and are meant
+    to be treated as immutable, which :meth:`freeze` enforces. The
+    dictionary returned by :meth:`as_dict` is built once and then cached,
+    so it should not be modified.
+    """
+
+    __slots__ = ("_value", "_desc", "_as_dict")
+
     _dtype: str
 
     def __init__(self, value: Any, desc: str | None = None, **kwds: dict[str, Any]):
         self._value = value
         self._desc = desc
+        self._as_dict: dict[str, Any] | None = None
+
+    def freeze(self) -> ModelParameter:
+        """Make the parameter read-only.
+
+        The parameter becomes an instance of a read-only subclass of its
+        class, so that unfrozen parameters don't pay for the check on
+        every assignment.
+
+        Returns
+        -------
+        ModelParameter
+            The (now frozen) parameter.
+        """
+        if not self.frozen:
+            self.__class__ = _frozen_class(self.__class__)
+        return self
+
+    @property
+    def frozen(self) -> bool:
+        return isinstance(self, _FrozenParameter)
 
     @property
     def desc(self) -> str | None:
@@ -187,11 +444,19 @@ class ModelParameter:
         return self._value
 
     def as_dict(self) -> dict[str, Any]:
+        if (d := self._as_dict) is None:
+            d = self._to_dict()
+            object.__setattr__(self, "_as_dict", d)
+        return d
+
+    def _to_dict(self) -> dict[str, Any]:
         value = {"default": self.value, "type": self._dtype}
         return {"description": self.desc, "value": value}
 
     def as_yaml(self) -> str:
-        return yaml.safe_dump(self.as_dict(), default_flow_style=False)
+        from model_metadata._yaml import safe_dump
+
+        return safe_dump(self.as_dict(), default_flow_style=False)
 
     @property
     def type(self) -> str:
@@ -201,15 +466,19 @@ class ModelParameter:
         return self.as_yaml()
 
     def __repr__(self) -> str:
-        kwds = ["desc"]
-        with contextlib.suppress(AttributeError):
-            kwds.extend(self._kwds)
-        args = [repr(self.value)] + [f"{arg}={getattr(self, arg)!r}" for arg in kwds]
+        args = [repr(self.value)] + [
+            f"{arg}={value!r}" for arg, value in self._repr_kwds().items()
+        ]
 
         return f"{self.__class__.__name__}({', '.join(args)}) "
 
+    def _repr_kwds(self) -> dict[str, Any]:
+        return {"desc": self._desc}
+
 
 class StringParameter(ModelParameter):
+    __slots__ = ()
+
     _dtype = "str"
 
     def __init__(self, value: str, desc: str | None = None, **kwds: dict[str, Any]):
@@ -223,7 +492,8 @@ class StringParameter(ModelParameter):
 
 
 class NumberParameter(ModelParameter):
-    _kwds = ("units", "range")
+    __slots__ = ("_range", "_units")
+
     _value: int | float
 
     def __init__(
@@ -253,8 +523,8 @@ class NumberParameter(ModelParameter):
 
         assert_in_bounds(self._value, self._range)
 
-    def as_dict(self) -> dict[str, Any]:
-        d = super().as_dict()
+    def _to_dict(self) -> dict[str, Any]:
+        d = super()._to_dict()
 
         value = d["value"]
         if self.units is not None:
@@ -270,6 +540,9 @@ class NumberParameter(ModelParameter):
 
         return d
 
+    def _repr_kwds(self) -> dict[str, Any]:
+        return {**super()._repr_kwds(), "units": self._units, "range": self._range}
+
     @property
     def units(self) -> str | None:
         return self._units
@@ -280,8 +553,9 @@ class NumberParameter(ModelParameter):
 
 
 class ChoiceParameter(ModelParameter):
+    __slots__ = ("_choices",)
+
     _dtype = "str"
-    _kwds: tuple[str, ...] = ("choices",)
     _choices: tuple[Any, ...]
 
     def __init__(
@@ -297,8 +571,8 @@ class ChoiceParameter(ModelParameter):
         if self.value not in self.choices:
             raise ValueError("value is not contained in choices")
 
-    def as_dict(self) -> dict[str, Any]:
-        d = super().as_dict()
+    def _to_dict(self) -> dict[str, Any]:
+        d = super()._to_dict()
 
         value = d["value"]
         if self.choices:
@@ -306,14 +580,18 @@ class ChoiceParameter(ModelParameter):
 
         return d
 
+    def _repr_kwds(self) -> dict[str, Any]:
+        return {**super()._repr_kwds(), "choices": self._choices}
+
     @property
     def choices(self) -> tuple[Any, ...]:
         return self._choices
 
 
 class BooleanParameter(ChoiceParameter):
+    __slots__ = ()
+
     _dtype = "bool"
-    _kwds = ("true_value", "false_value")
 
     def __init__(
         self,
@@ -326,6 +604,13 @@ class BooleanParameter(ChoiceParameter):
             self, value, desc=desc, choices=(true_value, false_value)
         )
 
+    def _repr_kwds(self) -> dict[str, Any]:
+        return {
+            "desc": self._desc,
+            "true_value": self._choices[0],
+            "false_value": self._choices[1],
+        }
+
     @property
     def true_value(self) -> Any:
         return self._choices[0]
@@ -340,8 +625,9 @@ class BooleanParameter(ChoiceParameter):
 
 
 class FileParameter(ChoiceParameter):
+    __slots__ = ()
+
     _dtype = "str"
-    _kwds = ("files",)
 
     def __init__(
         self,
@@ -354,12 +640,17 @@ class FileParameter(ChoiceParameter):
 
         super().__init__(value, desc=desc, choices=choices)
 
+    def _repr_kwds(self) -> dict[str, Any]:
+        return {"desc": self._desc, "files": self._choices}
+
     @property
     def files(self) -> tuple[str, ...]:
         return self.choices
 
 
 class FloatParameter(NumberParameter):
+    __slots__ = ()
+
     _dtype = "float"
 
     def __init__(
@@ -373,6 +664,8 @@ class FloatParameter(NumberParameter):
 
 
 class IntParameter(NumberParameter):
+    __slots__ = ()
+
     _dtype = "int"
 
     def __init__(
@@ -396,3 +689,60 @@ class IntParameter(NumberParameter):
                 f" an int ({value!r})"
             )
         super().__init__(int(value), desc=desc, range=range, units=units)
+
+
+class _FrozenParameter(ModelParameter):
+    """Base for the read-only versions of parameter classes."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(
+            f"cannot set {name!r}: {self.__class__.__name__} is frozen"
+        )
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(
+            f"cannot delete {name!r}: {self.__class__.__name__} is frozen"
+        )
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        cls = self.__class__.__mro__[2]
+        state = {
+            name: getattr(self, name)
+            for name in _slot_names(cls)
+            if hasattr(self, name)
+        }
+        return _unpickle_frozen, (cls, state)
+
+
+_FROZEN_CLASSES: dict[type[ModelParameter], type[ModelParameter]] = {}
+
+
+def _frozen_class(cls: type[ModelParameter]) -> type[ModelParameter]:
+    try:
+        return _FROZEN_CLASSES[cls]
+    except KeyError:
+        frozen = type(
+            cls.__name__,
+            (_FrozenParameter, cls),
+            {
+                "__slots__": (),
+                "__module__": cls.__module__,
+                "__qualname__": cls.__qualname__,
+            },
+        )
+        return _FROZEN_CLASSES.setdefault(cls, frozen)
+
+
+def _slot_names(cls: type) -> list[str]:
+    return [name for base in cls.__mro__ for name in base.__dict__.get("__slots__", ())]
+
+
+def _unpickle_frozen(
+    cls: type[ModelParameter], state: dict[str, Any]
+) -> ModelParameter:
+    param = cls.__new__(cls)
+    for name, value in state.items():
+        setattr(param, name, value)
+    return param.freeze()
@@ -1,23 +1,85 @@
 #! /usr/bin/env python
 from __future__ import annotations
 
+import contextlib
+import functools
+import hashlib
 import os
 import shutil
+import tempfile
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Sequence
+from concurrent.futures import FIRST_EXCEPTION
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from typing import Any
+from typing import TYPE_CHECKING
+from typing import TypeVar
 
-from jinja2 import Environment
-from jinja2 import FileSystemLoader as _FileSystemLoader
-from model_metadata._utils import as_cwd
 from model_metadata._utils import is_text_file
+from model_metadata._utils import link_file
+from model_metadata._utils import validate_link_mode
 from model_metadata.find import find_model_data_files
 from model_metadata.find import is_metadata_file
 from model_metadata.model_data_files import FileTemplate
 
+if TYPE_CHECKING:  # pragma: no cover
+    from jinja2 import Environment
+
+
+class StageManifest(tuple[str, ...]):
+    """The files staged by a loader.
+
+    A manifest is a tuple of the staged files, relative to the
+    destination folder, that also keeps track of which of those files
+    were left untouched because they were already up to date.
+
+    Parameters
+    ----------
+    files : iterable of str
+        The staged files.
+    skipped : iterable of str, optional
+        The staged files that were not (re)written.
+    dest : str, optional
+        The folder into which the files were staged, as it was given to
+        the loader.
+    """
+
+    skipped: tuple[str, ...]
+    dest: str
+
+    def __new__(
+        cls,
+        files: Iterable[str] = (),
+        skipped: Iterable[str] = (),
+        dest: str = ".",
+    ) -> StageManifest:
+        self = super().__new__(cls, files)
+        self.skipped = tuple(skipped)
+        self.dest = dest
+        return self
+
+    @property
+    def written(self) -> tuple[str, ...]:
+        """The staged files that were written."""
+        skipped = set(self.skipped)
+        return tuple(fname for fname in self if fname not in skipped)
+
 
 class OldFileSystemLoader:
-    def __init__(self, searchpath: str):
+    def __init__(
+        self,
+        searchpath: str,
+        incremental: bool = False,
+        link_mode: str = "copy",
+        max_workers: int | None = None,
+    ):
         self._base = os.path.abspath(searchpath)
         self._files = find_model_data_files(self._base)
+        self._incremental = incremental
+        self._link_mode = validate_link_mode(link_mode)
+        self._max_workers = _validate_max_workers(max_workers)
 
     @property
     def base(self) -> str:
@@ -27,55 +89,301 @@ class OldFileSystemLoader:
     def sources(self) -> tuple[str, ...]:
         return tuple(self._files)
 
-    def stage_all(self, destdir: str, **kwds: dict[str, Any]) -> tuple[str, ...]:
-        sources = (os.path.relpath(fn, self.base) for fn in self.sources)
-        with as_cwd(destdir, create=True):
-            manifest = (
-                p for src in sources if (p := self.stage(src, **kwds)) is not None
-            )
-        return tuple(manifest)
+    @property
+    def incremental(self) -> bool:
+        return self._incremental
+
+    @property
+    def link_mode(self) -> str:
+        return self._link_mode
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def stage_all(self, destdir: str, **kwds: dict[str, Any]) -> StageManifest:
+        absdest = os.path.abspath(destdir)
+        os.makedirs(absdest, exist_ok=True)
+
+        staged = _map_in_threads(
+            lambda src: self._render_source(
+                os.path.relpath(src, self.base), absdest, kwds
+            ),
+            self.sources,
+            max_workers=self._max_workers,
+        )
+
+        manifest, skipped = [], []
+        for staged_file, written in staged:
+            if staged_file is not None:
+                manifest.append(staged_file)
+                if not written:
+                    skipped.append(staged_file)
+        return StageManifest(manifest, skipped, dest=destdir)
 
     def stage(self, relpath: str, **kwds: dict[str, Any]) -> str | None:
-        src = os.path.join(self.base, relpath)
-        if os.path.isdir(src):
-            os.makedirs(os.path.realpath(relpath), exist_ok=True)
-            staged_file = None
-        else:
-            staged_file = self.render_source(relpath, **kwds)
-        return staged_file
+        return self.render_source(relpath, **kwds)
 
     def render_source(self, relpath: str, **kwds: dict[str, Any]) -> str | None:
+        return self._render_source(relpath, os.getcwd(), kwds)[0]
+
+    def _render_source(
+        self, relpath: str, destdir: str, kwds: dict[str, Any]
+    ) -> tuple[str | None, bool]:
+        """Stage a source file into a folder.
+
+        Returns the path to the staged file, relative to *destdir*,
+        (or ``None`` for a folder) and whether the file was written.
+        """
         src = os.path.join(self.base, relpath)
+        dst = os.path.join(destdir, relpath)
 
         if os.path.isdir(src):
-            os.makedirs(os.path.realpath(relpath), exist_ok=True)
-            staged_file = None
-        elif is_text_file(src):
-            staged_file = FileTemplate(src).to_file(relpath, **kwds)
+            os.makedirs(os.path.realpath(dst), exist_ok=True)
+            return None, False
+
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        if is_text_file(src):
+            base, ext = os.path.splitext(relpath)
+            staged_file = base if ext == ".tmpl" else relpath
+            template = FileTemplate(src)
+            written = _write_text(
+                os.path.join(destdir, staged_file),
+                lambda: template.stream(**kwds),
+                self._incremental,
+            )
+            return staged_file, written
         else:
-            shutil.copy2(src, relpath)
-            staged_file = relpath
-        return staged_file
+            return relpath, _copy_file(src, dst, self._incremental, self._link_mode)
 
 
 class FileSystemLoader:
-    def __init__(self, searchpath: str):
+    """Stage a model's input files from Jinja templates.
+
+    The Jinja environment, along with its compiled templates, is shared by
+    all loaders for the same folder so that staging a model repeatedly
+    only pays for rendering. Templates are recompiled if they change.
+
+    Parameters
+    ----------
+    searchpath : str
+        Path to the folder that contains the templates.
+    bytecode_cache_dir : str, optional
+        If given, also cache compiled templates in this folder, through
+        a :class:`jinja2.FileSystemBytecodeCache`, so they can be reused
+        by other processes.
+    incremental : bool, optional
+        If ``True``, only write files in the destination folder that are
+        missing or out of date. A rendered template is written only if
+        its contents differ from those of the existing file; a data file
+        is copied only if its size or modification time differ from
+        those of the existing copy.
+    link_mode : {"copy", "hardlink", "symlink", "reflink"}, optional
+        How to stage data files (files that are not templates). Files
+        that can't be linked are copied.
+    max_workers : int, optional
+        Maximum number of threads used to render templates and copy
+        files. The default is the number of CPUs, up to 8. Use 1 to
+        stage files one at a time.
+    """
+
+    def __init__(
+        self,
+        searchpath: str,
+        bytecode_cache_dir: str | None = None,
+        incremental: bool = False,
+        link_mode: str = "copy",
+        max_workers: int | None = None,
+    ):
         self._base = os.path.abspath(searchpath)
+        self._bytecode_cache_dir = (
+            None if bytecode_cache_dir is None else os.path.abspath(bytecode_cache_dir)
+        )
+        self._incremental = incremental
+        self._link_mode = validate_link_mode(link_mode)
+        self._max_workers = _validate_max_workers(max_workers)
+
+    @property
+    def incremental(self) -> bool:
+        return self._incremental
+
+    @property
+    def link_mode(self) -> str:
+        return self._link_mode
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
 
-    def stage_all(self, destdir: str, **defaults: dict[str, Any]) -> tuple[str, ...]:
-        env = Environment(loader=_FileSystemLoader(self._base))
+    @property
+    def environment(self) -> Environment:
+        return _jinja_environment(self._base, self._bytecode_cache_dir)
+
+    def stage_all(self, destdir: str, **defaults: dict[str, Any]) -> StageManifest:
+        env = self.environment
         manifest = env.list_templates(filter_func=lambda f: not is_metadata_file(f))
 
-        os.makedirs(destdir, exist_ok=True)
-        for fname in manifest:
+        def _stage(fname: str) -> bool:
             src_file = os.path.join(self._base, fname)
             dst_file = os.path.join(destdir, fname)
 
             os.makedirs(os.path.dirname(dst_file), exist_ok=True)
             if is_text_file(src_file):
-                with open(dst_file, "w") as fp:
-                    fp.write(env.get_template(fname).render(**defaults))
+                template = env.get_template(fname)
+                return _write_text(
+                    dst_file,
+                    lambda: template.generate(**defaults),
+                    self._incremental,
+                )
             else:
-                shutil.copy2(src_file, dst_file)
+                return _copy_file(
+                    src_file, dst_file, self._incremental, self._link_mode
+                )
+
+        os.makedirs(destdir, exist_ok=True)
+        written = _map_in_threads(_stage, manifest, max_workers=self._max_workers)
+
+        return StageManifest(
+            manifest,
+            [fname for fname, was_written in zip(manifest, written) if not was_written],
+            dest=destdir,
+        )
+
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def _map_in_threads(
+    func: Callable[[_T], _R], items: Sequence[_T], max_workers: int = 1
+) -> list[_R]:
+    """Call a function for each item, in a pool of threads.
+
+    Results are returned in the order of *items*. If any call raises an
+    exception, calls that have not yet started are cancelled and the
+    exception is re-raised once the running calls have finished.
+    """
+    if max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [executor.submit(func, item) for item in items]
+        _, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in not_done:
+            future.cancel()
+
+    for future in futures:
+        if not future.cancelled() and (error := future.exception()) is not None:
+            raise error
+
+    return [future.result() for future in futures]
+
+
+def _validate_max_workers(max_workers: int | None) -> int:
+    if max_workers is None:
+        return min(8, os.cpu_count() or 1)
+    elif max_workers < 1:
+        raise ValueError(f"max_workers must be a positive integer ({max_workers!r})")
+    return max_workers
+
+
+def _write_text(
+    dst: str, render: Callable[[], Iterable[str]], incremental: bool = False
+) -> bool:
+    """Write rendered text to a file, unless it already holds that text.
+
+    In incremental mode, the text is rendered once to compute a hash,
+    without writing anything, which is compared to the hash of the
+    existing file. Only if they differ is the text rendered again and
+    written to a temporary file that replaces the existing one. Neither
+    the text nor the existing file is ever held in memory all at once.
+
+    Parameters
+    ----------
+    dst : str
+        Path to the file to write.
+    render : callable
+        Function that returns the text, as an iterable of chunks. It is
+        called at most twice.
+    incremental : bool, optional
+        Skip writing the file if its contents would not change.
+
+    Returns
+    -------
+    bool
+        ``True`` if the file was written, ``False`` if it was skipped.
+    """
+    if not incremental or not os.path.isfile(dst):
+        with open(dst, "w") as fp:
+            fp.writelines(render())
+        return True
+
+    digest = hashlib.sha256()
+    for chunk in render():
+        digest.update(chunk.encode("utf-8", "surrogatepass"))
+    if digest.digest() == _text_digest(dst):
+        return False
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dst), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fp:
+            fp.writelines(render())
+        shutil.copymode(dst, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+    return True
+
+
+def _text_digest(path: str) -> bytes | None:
+    digest = hashlib.sha256()
+    try:
+        with open(path) as fp:
+            while chunk := fp.read(65536):
+                digest.update(chunk.encode("utf-8", "surrogatepass"))
+    except (OSError, UnicodeDecodeError):
+        return None
+    return digest.digest()
+
+
+def _copy_file(
+    src: str, dst: str, incremental: bool = False, link_mode: str = "copy"
+) -> bool:
+    """Copy (or link) a file, unless the destination is already a copy of it.
+
+    Returns
+    -------
+    bool
+        ``True`` if the file was copied, ``False`` if it was skipped.
+    """
+    if incremental:
+        with contextlib.suppress(OSError):
+            src_stat, dst_stat = os.stat(src), os.stat(dst)
+            if (src_stat.st_size, src_stat.st_mtime_ns) == (
+                dst_stat.st_size,
+                dst_stat.st_mtime_ns,
+            ):
+                return False
+
+    link_file(src, dst, mode=link_mode)
+    return True
+
+
+@functools.lru_cache(maxsize=64)
+def _jinja_environment(searchpath: str, bytecode_cache_dir: str | None) -> Environment:
+    from jinja2 import Environment
+    from jinja2 import FileSystemBytecodeCache
+    from jinja2 import FileSystemLoader as _FileSystemLoader
+
+    if bytecode_cache_dir is not None:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+    else:
+        bytecode_cache = None
 
-        return tuple(manifest)
+    return Environment(
+        loader=_FileSystemLoader(searchpath), bytecode_cache=bytecode_cache
+    )
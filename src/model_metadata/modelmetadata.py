@@ -6,27 +6,26 @@ import os
 import pathlib
 import sys
 import warnings
+from collections.abc import Iterable
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
-if sys.version_info >= (3, 12):  # pragma: no cover (PY12+)
-    from importlib.resources import files
-else:  # pragma: no cover (<PY312)
-    from importlib_resources import files
-import yaml
+from model_metadata._utils import find_component_metadata
+from model_metadata._utils import load_component
+from model_metadata._utils import parse_entry_point
+from model_metadata.cache import DiskCache
+from model_metadata.cache import MetadataCache
 from model_metadata.errors import BadEntryPointError
 from model_metadata.errors import MetadataNotFoundError
 from model_metadata.errors import MissingSectionError
 from model_metadata.errors import MissingValueError
 from model_metadata.find import find_metadata_files
+from model_metadata.load import load_meta
 from model_metadata.load import load_meta_section
 from model_metadata.model_info import ModelInfo
-from model_metadata.model_parameter import parameter_from_dict
-from model_metadata.model_parameter import setup_yaml_with_canonical_dict
-from model_metadata._utils import load_component
-from model_metadata._utils import parse_entry_point
-
-
-setup_yaml_with_canonical_dict()
+from model_metadata.model_parameter import normalize_parameters
+from model_metadata.parameter_table import ParameterTable
 
 
 def normalize_run_section(run: dict[str, Any] | None) -> dict[str, Any]:
@@ -46,43 +45,109 @@ def normalize_run_section(run: dict[str, Any] | None) -> dict[str, Any]:
     return normed
 
 
+def _read_only(value: Any) -> Any:
+    """Make a read-only view of a metadata tree.
+
+    Dicts are wrapped in read-only views and lists are copied to tuples;
+    all other values are shared with the original tree.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _read_only(val) for key, val in value.items()})
+    elif isinstance(value, list):
+        return tuple(_read_only(item) for item in value)
+    else:
+        return value
+
+
+def as_builtin(value: Any) -> Any:
+    """Convert a read-only view of metadata to plain dicts and lists.
+
+    The result is a new tree that can be changed, pickled or serialized
+    (as JSON or YAML) without affecting the metadata it came from.
+    """
+    if isinstance(value, Mapping):
+        return {key: as_builtin(val) for key, val in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [as_builtin(item) for item in value]
+    else:
+        return value
+
+
+def _warn_private_parameters(names: Iterable[str]) -> None:
+    for name in names:
+        warnings.warn(
+            f"{name}: ignoring private attribute in parameters section",
+            stacklevel=3,
+        )
+
+
 class ModelMetadata:
     SECTIONS = ("api", "info", "parameters", "run")
+    cache = MetadataCache()
+    disk_cache = DiskCache.from_env()
 
     def __init__(self, path: str):
         # self._path = find(path)
         self._path = os.path.abspath(path)
 
         self._files = find_metadata_files(self._path)
+        self._view: Mapping[str, Any] | None = None
+        self._parameter_table: ParameterTable | None = None
+
+        if self.disk_cache is not None:
+            key = self.disk_cache.key(self._path)
+            entry = self.disk_cache.get(key)
+            if isinstance(entry, tuple) and len(entry) == 2:
+                self._meta, private = entry
+                _warn_private_parameters(private)
+                return
+
         self._meta = self.load_all()
 
-        self._meta["info"].setdefault("name", self.api["name"])
+        self._meta["info"].setdefault("name", self._meta.get("api", {})["name"])
         self._meta["info"] = ModelInfo.norm(self._meta["info"])
         self._meta["run"] = normalize_run_section(self._meta.get("run"))
 
         params = self._meta.pop("parameters", {})
-        self._meta["parameters"] = {}
 
-        public = (name for name in params if not name.startswith("_"))
-        for name in public:
-            try:
-                param = parameter_from_dict(params[name]).as_dict()
-            except ValueError:
-                raise ValueError(f"{name}: unable to load parameter")
-            else:
-                self._meta["parameters"][name] = param
+        self._meta["parameters"] = normalize_parameters(
+            {name: param for name, param in params.items() if not name.startswith("_")}
+        )
 
-        private = (name for name in params if name.startswith("_"))
-        for name in private:
-            warnings.warn(
-                f"{name}: ignoring private attribute in parameters section",
-                stacklevel=2,
-            )
+        private = tuple(name for name in params if name.startswith("_"))
+        _warn_private_parameters(private)
+
+        if self.disk_cache is not None:
+            self.disk_cache.put(key, (self._meta, private))
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {**self.__dict__, "_view": None, "_parameter_table": None}
 
     @classmethod
     def from_obj(cls, obj: type) -> ModelMetadata:
         return cls(ModelMetadata.find(obj))
 
+    @classmethod
+    def load(cls, path: str) -> ModelMetadata:
+        """Load a model's metadata, reusing an already-loaded copy.
+
+        Loaded metadata are kept in a process-wide cache, ``ModelMetadata.cache``,
+        which is invalidated whenever any of the model's metadata files
+        changes. The returned object is shared by all callers; its metadata
+        are exposed as read-only views so they can't be modified.
+
+        Parameters
+        ----------
+        path : str
+            Path to the folder containing model metadata.
+
+        Returns
+        -------
+        ModelMetadata
+            The model's metadata.
+        """
+        return cls.cache.get(str(path), cls)
+
     @staticmethod
     def search_paths(model: str | pathlib.Path | type) -> tuple[str, ...]:
         """List of paths to search in looking for a model's metadata.
@@ -98,13 +163,24 @@ class ModelMetadata:
         -------
         list of Paths
             Paths to search for metadata.
+
+        Notes
+        -----
+        If the model is given as an entry point, its *METADATA* attribute
+        is first looked for in the source of its module, without importing
+        it. The module is only imported if that fails.
         """
+        paths = []
+
         if isinstance(model, (str, pathlib.Path)):
             model = str(model)
             with contextlib.suppress(BadEntryPointError):
-                model = load_component(*parse_entry_point(model))
-
-        paths = []
+                module_name, class_name = parse_entry_point(model)
+                if found := find_component_metadata(module_name, class_name):
+                    paths.append(os.path.realpath(os.path.join(*found)))
+                    model = class_name
+                else:
+                    model = load_component(module_name, class_name)
 
         def _model_module(model: type) -> str:
             try:
@@ -119,6 +195,11 @@ class ModelMetadata:
                 return model.__class__.__name__
 
         if not isinstance(model, str) and hasattr(model, "METADATA"):
+            if sys.version_info >= (3, 12):  # pragma: no cover (PY12+)
+                from importlib.resources import files
+            else:  # pragma: no cover (<PY312)
+                from importlib_resources import files
+
             path_to_module = str(files(_model_module(model)))
 
             try:
@@ -178,11 +259,35 @@ class ModelMetadata:
         ------
         MetadataNotFoundError
             If a metadata folder cannot be found.
+
+        Notes
+        -----
+        Entry points are first looked up in the installed-model index (see
+        :mod:`model_metadata.registry`), which avoids importing the
+        model's module. Model names are looked up in the index only if
+        they are not found along the usual search paths.
         """
+        from model_metadata.registry import lookup
+
+        is_entry_point = False
+        if isinstance(model, (str, pathlib.Path)):
+            with contextlib.suppress(BadEntryPointError):
+                is_entry_point = bool(parse_entry_point(str(model)))
+            if is_entry_point and (path := lookup(str(model))):
+                return path
+
         for p in ModelMetadata.search_paths(model):
             # if p.is_dir():
             if os.path.isdir(p):
                 return p
+
+        if (
+            isinstance(model, (str, pathlib.Path))
+            and not is_entry_point
+            and (path := lookup(str(model)))
+        ):
+            return path
+
         raise MetadataNotFoundError(str(model))
 
     def get(self, key: str) -> Any:
@@ -194,7 +299,7 @@ class ModelMetadata:
             Name of a value or section in dotted notation. For example,
             `run.config_file.path`.
         """
-        val, section = self._meta, ""
+        val, section = self.meta, ""
         for name in key.split("."):
             section = ".".join([section, name])
             try:
@@ -211,42 +316,74 @@ class ModelMetadata:
 
     @staticmethod
     def format(value: Any) -> str:
-        return yaml.safe_dump(value)
+        from model_metadata._yaml import safe_dump
+
+        return safe_dump(value)
 
     @property
     def base(self) -> str:
         return self._path
 
     @property
-    def meta(self) -> dict[str, Any]:
-        return self._meta
+    def meta(self) -> Mapping[str, Any]:
+        """The model's metadata, as a read-only view.
+
+        Mappings in the view are read-only and lists are returned as
+        tuples. The view is built once, on first access, by copying the
+        dicts and lists of the metadata (but not the values they hold) and
+        can then be shared, without copying, by any number of callers and
+        threads. Use :func:`as_builtin` to get a mutable copy.
+        """
+        if self._view is None:
+            self._view = _read_only(self._meta)
+        return self._view
 
     @property
     def name(self) -> str:
         return self.info["name"]
 
     @property
-    def api(self) -> dict[str, Any]:
-        return self._meta.get("api", {})
+    def api(self) -> Mapping[str, Any]:
+        return self.meta.get("api", {})
 
     @property
-    def info(self) -> dict[str, Any]:
-        return self._meta.get("info", {})
+    def info(self) -> Mapping[str, Any]:
+        return self.meta.get("info", {})
 
     @property
-    def parameters(self) -> dict[str, Any]:
-        return self._meta.get("parameters", {})
+    def parameters(self) -> Mapping[str, Any]:
+        return self.meta.get("parameters", {})
 
     @property
-    def run(self) -> dict[str, Any]:
-        return self._meta["run"]
+    def run(self) -> Mapping[str, Any]:
+        return self.meta["run"]
+
+    def parameter_table(self) -> ParameterTable:
+        """Get the model's parameters as a table.
+
+        The table is built the first time it is asked for and reused
+        after that.
+
+        Returns
+        -------
+        ParameterTable
+            A columnar view of the parameters, with numeric columns for
+            their default values and bounds.
+        """
+        if self._parameter_table is None:
+            self._parameter_table = ParameterTable(self.parameters)
+        return self._parameter_table
 
     def dump(self) -> str:
-        return yaml.safe_dump(self.meta)
+        from model_metadata._yaml import safe_dump
+
+        return safe_dump(self.meta)
 
     def dump_section(self, section: str | None = None) -> str:
+        from model_metadata._yaml import safe_dump
+
         if section:
-            return yaml.safe_dump({section: self.meta.get(section, {})})
+            return safe_dump({section: self.meta.get(section, {})})
         else:
             return self.dump()
 
@@ -254,4 +391,4 @@ class ModelMetadata:
         return load_meta_section(self.base, section)
 
     def load_all(self) -> dict[str, Any]:
-        return {section: self.load_section(section) for section in self.SECTIONS}
+        return load_meta(self.base, self.SECTIONS)
@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import array
+import contextlib
+import math
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from typing import Any
+from typing import NamedTuple
+
+from model_metadata.errors import UnknownKeyError
+
+NUMERIC_TYPES = ("float", "int")
+
+
+class SampleCheck(NamedTuple):
+    valid: Any
+    violations: dict[str, int]
+
+
+class ParameterTable:
+    """A columnar view of a model's parameters.
+
+    Each attribute of the parameters (name, type, default value, bounds,
+    units, ...) is stored as a column, with one entry per parameter.
+    The *default*, *min* and *max* columns are read-only, contiguous
+    arrays of doubles that can be passed, without copying, to NumPy or
+    any other library that supports the buffer protocol. Non-numeric
+    parameters have a default and bounds of NaN, while missing bounds of
+    numeric parameters are infinite.
+
+    Parameters
+    ----------
+    parameters : mapping
+        Normalized parameters, as found in :attr:`ModelMetadata.parameters`.
+
+    Examples
+    --------
+    >>> from model_metadata.parameter_table import ParameterTable
+    >>> table = ParameterTable(
+    ...     {
+    ...         "dt": {
+    ...             "description": "Time step",
+    ...             "value": {
+    ...                 "default": 1.0,
+    ...                 "type": "float",
+    ...                 "units": "d",
+    ...                 "range": {"min": 0.0},
+    ...             },
+    ...         }
+    ...     }
+    ... )
+    >>> table.names
+    ('dt',)
+    >>> list(table.min), list(table.max)
+    ([0.0], [inf])
+    """
+
+    def __init__(self, parameters: Mapping[str, Mapping[str, Any]]):
+        names: list[str] = []
+        types: list[str] = []
+        units: list[str | None] = []
+        descriptions: list[str | None] = []
+        choices: list[tuple[Any, ...] | None] = []
+        defaults: list[Any] = []
+        default = array.array("d")
+        min_ = array.array("d")
+        max_ = array.array("d")
+
+        for name, param in parameters.items():
+            value = param["value"]
+            dtype = value["type"]
+
+            names.append(name)
+            types.append(dtype)
+            units.append(value.get("units"))
+            descriptions.append(param.get("description"))
+            choices.append(value.get("choices"))
+            defaults.append(value["default"])
+
+            if dtype in NUMERIC_TYPES:
+                range_ = value.get("range", {})
+                default.append(value["default"])
+                min_.append(range_.get("min", -math.inf))
+                max_.append(range_.get("max", math.inf))
+            else:
+                default.append(math.nan)
+                min_.append(math.nan)
+                max_.append(math.nan)
+
+        self._names = tuple(names)
+        self._types = tuple(types)
+        self._units = tuple(units)
+        self._descriptions = tuple(descriptions)
+        self._choices = tuple(choices)
+        self._defaults = tuple(defaults)
+        self._default = memoryview(default).toreadonly()
+        self._min = memoryview(min_).toreadonly()
+        self._max = memoryview(max_).toreadonly()
+        self._index = {name: index for index, name in enumerate(self._names)}
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return self._names
+
+    @property
+    def types(self) -> tuple[str, ...]:
+        return self._types
+
+    @property
+    def units(self) -> tuple[str | None, ...]:
+        return self._units
+
+    @property
+    def descriptions(self) -> tuple[str | None, ...]:
+        return self._descriptions
+
+    @property
+    def choices(self) -> tuple[tuple[Any, ...] | None, ...]:
+        """Allowed values of choice parameters (``None`` for others)."""
+        return self._choices
+
+    @property
+    def defaults(self) -> tuple[Any, ...]:
+        """Default values of all parameters, numeric or not."""
+        return self._defaults
+
+    @property
+    def default(self) -> memoryview:
+        """Default values, as doubles."""
+        return self._default
+
+    @property
+    def min(self) -> memoryview:
+        """Lower bounds, as doubles."""
+        return self._min
+
+    @property
+    def max(self) -> memoryview:
+        """Upper bounds, as doubles."""
+        return self._max
+
+    @property
+    def numeric(self) -> tuple[bool, ...]:
+        """Whether each of the parameters is a number."""
+        return tuple(dtype in NUMERIC_TYPES for dtype in self._types)
+
+    def index(self, name: str) -> int:
+        """Get the row of a parameter."""
+        return self._index[name]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self)} parameters)"
+
+    def check_samples(
+        self, samples: Any, names: Iterable[str] | None = None
+    ) -> SampleCheck:
+        """Check many sets of parameter values against the metadata.
+
+        Values of numbers must be within their parameter's range (and
+        whole numbers for integers), values of choice parameters must be
+        one of their choices, and values of strings must be strings. The
+        checks are done column by column, with NumPy. Text values of
+        numeric parameters are parsed as numbers, and text values of choice
+        parameters are compared with their choices as text, so a 2-D array
+        that mixes numbers and strings (which NumPy turns into an array of
+        strings) is checked value by value.
+
+        Requires *numpy*.
+
+        Parameters
+        ----------
+        samples : array_like or mapping of array_like
+            Either a 2-D array with one row per sample and one column per
+            parameter, or 1-D arrays of equal length keyed by parameter
+            name.
+        names : iterable of str, optional
+            For a 2-D array, the parameters of each of its columns. The
+            default is all of the parameters, in the order of the table.
+
+        Returns
+        -------
+        SampleCheck
+            A boolean array, *valid*, that is ``True`` for the samples
+            whose values are all valid, and the number of invalid values of
+            each parameter, *violations*.
+
+        Raises
+        ------
+        UnknownKeyError
+            If there are samples of a parameter that is not in the table.
+        ValueError
+            If the samples are not a 2-D array, or the arrays are not
+            the same length.
+
+        Examples
+        --------
+        >>> from model_metadata.parameter_table import ParameterTable
+        >>> table = ParameterTable(
+        ...     {"dt": {"value": {"default": 1.0, "type": "float",
+        ...                       "range": {"min": 0.0, "max": 10.0}}}}
+        ... )
+        >>> valid, violations = table.check_samples({"dt": [-1.0, 5.0, 20.0]})
+        >>> valid.tolist(), violations
+        ([False, True, False], {'dt': 2})
+        """
+        import numpy as np
+
+        columns = self._sample_columns(np, samples, names)
+
+        n_samples = len(next(iter(columns.values()))) if columns else 0
+        valid = np.ones(n_samples, dtype=bool)
+        violations = {}
+        for name, values in columns.items():
+            invalid = self._invalid(np, self._index[name], values)
+            violations[name] = int(np.count_nonzero(invalid))
+            valid &= ~invalid
+
+        return SampleCheck(valid, violations)
+
+    def _sample_columns(
+        self, np: Any, samples: Any, names: Iterable[str] | None
+    ) -> dict[str, Any]:
+        if isinstance(samples, Mapping):
+            names = list(samples)
+            columns = [np.asarray(samples[name]) for name in names]
+            if any(values.ndim != 1 for values in columns):
+                raise ValueError("samples must be 1-D arrays")
+            if len({len(values) for values in columns}) > 1:
+                raise ValueError("samples must all be the same length")
+        else:
+            samples = np.asarray(samples)
+            if samples.ndim != 2:
+                raise ValueError(f"samples must be a 2-D array (got {samples.ndim}-D)")
+            names = list(self._names if names is None else names)
+            if len(names) != samples.shape[1]:
+                raise ValueError(
+                    f"number of names does not match the number of columns"
+                    f" ({len(names)} != {samples.shape[1]})"
+                )
+            if len(set(names)) != len(names):
+                raise ValueError("names must be unique")
+            columns = list(samples.T)
+
+        if unknown := [name for name in names if name not in self._index]:
+            raise UnknownKeyError(unknown)
+
+        return dict(zip(names, columns))
+
+    def _invalid(self, np: Any, row: int, values: Any) -> Any:
+        is_text = values.dtype.kind in "SU"
+
+        if (choices := self._choices[row]) is not None:
+            invalid = ~np.isin(values, choices)
+            if is_text:
+                invalid &= ~np.isin(values, [str(choice) for choice in choices])
+            return invalid
+        elif self._types[row] in NUMERIC_TYPES:
+            values, invalid = _as_floats(np, values)
+            invalid |= ~((values >= self._min[row]) & (values <= self._max[row]))
+            if self._types[row] == "int":
+                invalid |= np.trunc(values) != values
+            return invalid
+        else:
+            return np.full(len(values), values.dtype.kind in "biufc")
+
+    def to_dict(self) -> dict[str, tuple[Any, ...]]:
+        """Get the columns of the table as tuples, keyed by column name."""
+        return {
+            "name": self._names,
+            "type": self._types,
+            "default": tuple(self._default),
+            "min": tuple(self._min),
+            "max": tuple(self._max),
+            "units": self._units,
+            "description": self._descriptions,
+            "choices": self._choices,
+        }
+
+    def to_numpy(self) -> Any:
+        """Convert the table to a NumPy structured array.
+
+        Text columns are stored as unicode strings (``None`` becomes an
+        empty string) and *choices* are left out.
+
+        Requires *numpy*.
+        """
+        import numpy as np
+
+        text = {
+            "name": self._names,
+            "type": self._types,
+            "units": tuple(units or "" for units in self._units),
+            "description": tuple(desc or "" for desc in self._descriptions),
+        }
+        dtype = [
+            (column, f"U{max((len(s) for s in values), default=0) or 1}")
+            for column, values in text.items()
+        ] + [("default", "f8"), ("min", "f8"), ("max", "f8")]
+
+        table = np.empty(len(self), dtype=dtype)
+        for column, values in text.items():
+            table[column] = values
+        table["default"] = np.frombuffer(self._default, dtype="f8")
+        table["min"] = np.frombuffer(self._min, dtype="f8")
+        table["max"] = np.frombuffer(self._max, dtype="f8")
+
+        return table
+
+    def to_arrow(self) -> Any:
+        """Convert the table to a :class:`pyarrow.Table`.
+
+        Requires *pyarrow*.
+        """
+        import pyarrow as pa
+
+        columns = self.to_dict()
+        columns["choices"] = tuple(
+            None if choices is None else [str(choice) for choice in choices]
+            for choices in self._choices
+        )
+        return pa.table(
+            {
+                name: (
+                    pa.array(values, type=pa.float64())
+                    if name in ("default", "min", "max")
+                    else pa.array(values)
+                )
+                for name, values in columns.items()
+            }
+        )
+
+    def to_pandas(self) -> Any:
+        """Convert the table to a :class:`pandas.DataFrame`, indexed by name.
+
+        Requires *pandas*.
+        """
+        import pandas as pd
+
+        columns = self.to_dict()
+        names = columns.pop("name")
+        return pd.DataFrame(columns, index=pd.Index(names, name="name"))
+
+
+def _as_floats(np: Any, values: Any) -> tuple[Any, Any]:
+    """Convert values to floats, flagging those that aren't numbers.
+
+    Text (for example, the columns of a 2-D array that mixes numbers and
+    strings) is parsed as numbers. Only if a column can't be converted as
+    a whole are its values converted one at a time.
+    """
+    with contextlib.suppress(TypeError, ValueError):
+        return values.astype(float), np.zeros(len(values), dtype=bool)
+
+    floats = np.full(len(values), np.nan)
+    invalid = np.zeros(len(values), dtype=bool)
+    for n, value in enumerate(values):
+        try:
+            floats[n] = float(value)
+        except (TypeError, ValueError):
+            invalid[n] = True
+    return floats, invalid
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import warnings
+from collections.abc import Iterable
+from typing import Any
+
+from model_metadata.errors import MetadataNotFoundError
+
+INDEX_FORMAT = 1
+
+_loaded: dict[str, tuple[tuple[int, int], dict[str, Any]]] = {}
+
+
+def default_sharedir() -> str:
+    """Path to the folder where model metadata are installed."""
+    return os.path.join(sys.prefix, "share", "csdms")
+
+
+def default_index_path() -> str:
+    """Path to the default registry index.
+
+    This is *index.json* within the installed-model folder unless the
+    ``MODEL_METADATA_INDEX`` environment variable is set.
+    """
+    return os.environ.get("MODEL_METADATA_INDEX") or os.path.join(
+        default_sharedir(), "index.json"
+    )
+
+
+def build_index(
+    sharedir: str | None = None,
+    entry_points: Iterable[str] = (),
+    group: str | None = None,
+) -> dict[str, Any]:
+    """Build an index of installed models.
+
+    Parameters
+    ----------
+    sharedir : str, optional
+        Folder that contains installed model metadata, one model per
+        sub-folder. The default is *share/csdms* under ``sys.prefix``.
+    entry_points : iterable of str, optional
+        Entry points (*module:class*) of models to add to the index.
+    group : str, optional
+        Name of an entry-point group whose models will be added to the index.
+
+    Returns
+    -------
+    dict
+        The index, which maps model names and entry points to
+        metadata folders. Models whose metadata can't be loaded are left
+        out of the index, with a warning.
+    """
+    from importlib.metadata import entry_points as _entry_points
+
+    from model_metadata.modelmetadata import ModelMetadata
+
+    sharedir = default_sharedir() if sharedir is None else sharedir
+
+    models: dict[str, dict[str, Any]] = {}
+    lookup: dict[str, str] = {}
+
+    def _add(path: str, alias: str) -> None:
+        path = os.path.realpath(path)
+        if path not in models:
+            meta = ModelMetadata(path)
+            models[path] = {
+                "name": meta.name,
+                "version": meta.info.get("version"),
+                "summary": meta.info.get("summary"),
+            }
+            lookup.setdefault(meta.name, path)
+        lookup[alias] = path
+
+    if os.path.isdir(sharedir):
+        for name in sorted(os.listdir(sharedir)):
+            path = os.path.join(sharedir, name)
+            if os.path.isdir(path):
+                try:
+                    _add(path, name)
+                except Exception as error:
+                    warnings.warn(
+                        f"{path}: skipping ({_describe(error)})", stacklevel=2
+                    )
+
+    entry_points = list(entry_points)
+    if group:
+        entry_points += [ep.value for ep in _entry_points(group=group)]
+
+    for entry_point in entry_points:
+        try:
+            _add(ModelMetadata.find(entry_point), entry_point)
+        except Exception as error:
+            warnings.warn(f"{entry_point}: skipping ({_describe(error)})", stacklevel=2)
+
+    return {"format": INDEX_FORMAT, "models": models, "lookup": lookup}
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, (ImportError, MetadataNotFoundError, ValueError)):
+        return str(error)
+    else:
+        return f"{error.__class__.__name__}: {error}"
+
+
+def write_index(index: dict[str, Any], path: str | None = None) -> str:
+    """Write an index to a file, atomically.
+
+    Parameters
+    ----------
+    index : dict
+        The index, as created by :func:`build_index`.
+    path : str, optional
+        Path to the index file.
+
+    Returns
+    -------
+    str
+        Path to the index file.
+    """
+    path = os.path.abspath(default_index_path() if path is None else path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fp:
+            json.dump(index, fp, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+    return path
+
+
+def load_index(path: str | None = None) -> dict[str, Any]:
+    """Load an index file.
+
+    Loaded indexes are cached until the file changes. A missing,
+    unreadable or out-of-date index is treated as empty.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path to the index file.
+
+    Returns
+    -------
+    dict
+        The index.
+    """
+    path = os.path.abspath(default_index_path() if path is None else path)
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return _empty_index()
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with contextlib.suppress(KeyError):
+        cached_signature, index = _loaded[path]
+        if cached_signature == signature:
+            return index
+
+    try:
+        with open(path) as fp:
+            index = json.load(fp)
+    except (OSError, ValueError):
+        return _empty_index()
+
+    if not isinstance(index, dict) or index.get("format") != INDEX_FORMAT:
+        return _empty_index()
+
+    _loaded[path] = (signature, index)
+
+    return index
+
+
+def lookup(name: str, path: str | None = None) -> str | None:
+    """Look up a model's metadata folder in an index.
+
+    Parameters
+    ----------
+    name : str
+        Name or entry point of a model.
+    path : str, optional
+        Path to the index file.
+
+    Returns
+    -------
+    str or None
+        Path to the model's metadata folder, or ``None`` if the model
+        is not in the index or its folder no longer exists.
+    """
+    path_to_metadata = load_index(path)["lookup"].get(name)
+    if path_to_metadata and os.path.isdir(path_to_metadata):
+        return path_to_metadata
+    return None
+
+
+def _empty_index() -> dict[str, Any]:
+    return {"format": INDEX_FORMAT, "models": {}, "lookup": {}}
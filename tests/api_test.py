@@ -1,17 +1,23 @@
 from __future__ import annotations
 
 import itertools
+import json
 import os
 import pathlib
 
 import pytest
+import yaml
+from model_metadata.api import check_samples
 from model_metadata.api import find
 from model_metadata.api import query
+from model_metadata.api import query_many
 from model_metadata.api import stage
+from model_metadata.api import stage_many
 from model_metadata.errors import MetadataNotFoundError
 from model_metadata.errors import MissingSectionError
 from model_metadata.errors import MissingValueError
 from model_metadata.errors import UnknownKeyError
+from model_metadata.modelmetadata import ModelMetadata
 
 
 class Model:
@@ -107,6 +113,64 @@ def test_stage_with_unknown_parameters(tmpdir, shared_datadir, params):
         stage(str(shared_datadir), parameters=params)
 
 
+def test_query_many(shared_datadir):
+    values = query_many(shared_datadir, ["info.version", "info.name", "run"])
+    assert list(values) == ["info.version", "info.name", "run"]
+    assert values["info.version"] == "10.6"
+    assert values["info.name"] == "child"
+    assert values["run"]["config_file"]["path"] == "child.in"
+
+
+@pytest.mark.parametrize("n_vars", (1, 4, 16))
+def test_query_many_loads_once(shared_datadir, monkeypatch, n_vars):
+    load_all = ModelMetadata.load_all
+    calls = []
+
+    def _load_all(self):
+        calls.append(self.base)
+        return load_all(self)
+
+    monkeypatch.setattr(ModelMetadata, "load_all", _load_all)
+
+    query_many(shared_datadir, ["info.version"] * n_vars)
+    assert len(calls) == 1
+
+
+def test_query_many_with_bad_value(shared_datadir):
+    with pytest.raises(MissingValueError):
+        query_many(shared_datadir, ["info.version", "info.not_a_value"])
+
+
+def test_check_samples(shared_datadir):
+    np = pytest.importorskip("numpy")
+
+    samples = {
+        "run_duration": np.array([0.5, 10.0, 100.0]),
+        "uplift_type": np.array([0, 1, 3]),
+    }
+    valid, violations = check_samples(shared_datadir, samples)
+    assert valid.tolist() == [False, True, False]
+    assert violations == {"run_duration": 1, "uplift_type": 1}
+
+
+def test_query_returns_builtins(shared_datadir):
+    with open(shared_datadir / "api.yaml", "a") as fp:
+        fp.write("grids:\n  - {id: 0, type: uniform_rectilinear}\n  - {id: 1}\n")
+
+    api = query(shared_datadir, "api")
+    assert type(api) is dict
+    assert api["grids"] == [{"id": 0, "type": "uniform_rectilinear"}, {"id": 1}]
+    assert json.loads(json.dumps(api)) == api
+    assert yaml.safe_load(yaml.safe_dump(api)) == api
+
+    api["grids"].append({"id": 2})
+    assert query(shared_datadir, "api.grids") == [
+        {"id": 0, "type": "uniform_rectilinear"},
+        {"id": 1},
+    ]
+    assert query_many(shared_datadir, ["api"])["api"]["grids"][1] == {"id": 1}
+
+
 def test_query_with_bad_section(shared_datadir):
     with pytest.raises(MissingSectionError):
         query(str(shared_datadir), "not-a-section.version")
@@ -125,3 +189,115 @@ def test_query_with_bad_path(tmpdir):
 def test_stage_with_bad_path(tmpdir):
     with pytest.raises(MetadataNotFoundError), tmpdir.as_cwd():
         stage("./not/a/path", ".")
+
+
+@pytest.fixture
+def stagedir(tmp_path):
+    stagedir = tmp_path / "ensemble"
+    stagedir.mkdir()
+    return stagedir
+
+
+def _runtime(path):
+    with open(path) as fp:
+        for this, next_ in itertools.pairwise(fp):
+            if this.startswith("RUNTIME"):
+                return next_.split()[0]
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_stage_many(stagedir, shared_datadir, jobs):
+    ensemble = [{"run_duration": 100}, {"run_duration": 200}, {}]
+    manifests = stage_many(
+        shared_datadir,
+        ensemble,
+        dest_pattern=str(stagedir / "run-{index:02d}"),
+        jobs=jobs,
+    )
+
+    assert len(manifests) == 3
+    for index, manifest in enumerate(manifests):
+        assert manifest.dest == str(stagedir / f"run-{index:02d}")
+        assert set(manifest) == set(os.listdir(manifest.dest))
+    assert _runtime(stagedir / "run-00" / "child.in") == "100"
+    assert _runtime(stagedir / "run-01" / "child.in") == "200"
+    assert _runtime(stagedir / "run-02" / "child.in") == "5000.0"
+
+
+def test_stage_many_pattern_with_parameters(stagedir, shared_datadir):
+    stage_many(
+        shared_datadir,
+        [{"run_duration": 100}, {"run_duration": 200}],
+        dest_pattern=str(stagedir / "duration-{run_duration}"),
+    )
+    assert sorted(os.listdir(stagedir)) == ["duration-100", "duration-200"]
+
+
+@pytest.mark.parametrize("old_style_templates", (False, True))
+def test_stage_many_with_index_parameter(stagedir, shared_datadir, old_style_templates):
+    with open(shared_datadir / "parameters.yaml", "a") as fp:
+        fp.write("index:\n  value:\n    type: int\n    default: 7\n")
+
+    manifests = stage_many(
+        shared_datadir,
+        [{"index": 10, "run_duration": 1}, {"index": 10, "run_duration": 1}],
+        dest_pattern=str(stagedir / "run-{index}-{run_duration}"),
+        old_style_templates=old_style_templates,
+    )
+    assert [manifest.dest for manifest in manifests] == [
+        str(stagedir / "run-0-1"),
+        str(stagedir / "run-1-1"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "pattern", ("{0}", "{}", "{not_a_parameter}", "{index.real.foo}", "{index:s}", "{")
+)
+def test_stage_many_with_bad_pattern(stagedir, shared_datadir, pattern):
+    with pytest.raises(ValueError, match="unable to format destination pattern"):
+        stage_many(shared_datadir, [{}, {}], dest_pattern=str(stagedir / pattern))
+    assert os.listdir(stagedir) == []
+
+
+def test_stage_many_validates_before_staging(stagedir, shared_datadir):
+    with pytest.raises(UnknownKeyError):
+        stage_many(
+            shared_datadir,
+            [{"run_duration": 100}, {"foo": "bar"}],
+            dest_pattern=str(stagedir / "{index}"),
+        )
+    assert os.listdir(stagedir) == []
+
+
+def test_stage_many_with_duplicate_dest(stagedir, shared_datadir):
+    with pytest.raises(ValueError):
+        stage_many(shared_datadir, [{}, {}], dest_pattern=str(stagedir / "run"))
+    assert os.listdir(stagedir) == []
+
+
+@pytest.mark.parametrize("old_style_templates", (False, True))
+def test_stage_from_many_threads(stagedir, shared_datadir, old_style_templates):
+    from concurrent.futures import ThreadPoolExecutor
+
+    cwd = os.getcwd()
+    (shared_datadir / "grid.bin").write_bytes(bytes(range(256)) * 64)
+
+    def _stage(n):
+        return stage(
+            shared_datadir,
+            str(stagedir / f"run-{n}"),
+            old_style_templates=old_style_templates,
+            parameters={"run_duration": n},
+        )
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        manifests = list(executor.map(_stage, range(64)))
+
+    assert os.getcwd() == cwd
+    for n, manifest in enumerate(manifests):
+        assert sorted(manifest) == ["child.in", "grid.bin"]
+        assert (stagedir / f"run-{n}" / "grid.bin").read_bytes() == (
+            shared_datadir / "grid.bin"
+        ).read_bytes()
+        if not old_style_templates:
+            assert _runtime(stagedir / f"run-{n}" / "child.in") == str(n)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import os
+import pickle
+import shutil
+
+import pytest
+from model_metadata import ModelMetadata
+from model_metadata.cache import DiskCache
+from model_metadata.cache import metadata_signature
+from model_metadata.cache import MetadataCache
+from model_metadata.errors import MetadataNotFoundError
+
+
+class Exploit:
+    def __reduce__(self):
+        return (pytest.fail, ("cache entry was unpickled",))
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = MetadataCache(maxsize=2)
+    monkeypatch.setattr(ModelMetadata, "cache", cache)
+    return cache
+
+
+def test_cache_hit(shared_datadir, cache):
+    meta = ModelMetadata.load(shared_datadir)
+    assert ModelMetadata.load(str(shared_datadir)) is meta
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(cache) == 1
+
+
+def test_cache_invalidated_on_change(shared_datadir, cache):
+    meta = ModelMetadata.load(shared_datadir)
+    assert meta.info["version"] == "10.6"
+
+    path_to_info = shared_datadir / "info.yaml"
+    path_to_info.write_text(path_to_info.read_text().replace('"10.6"', '"10.6.1"'))
+
+    new_meta = ModelMetadata.load(shared_datadir)
+    assert new_meta is not meta
+    assert new_meta.info["version"] == "10.6.1"
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_cache_invalidated_on_mtime(shared_datadir, cache):
+    meta = ModelMetadata.load(shared_datadir)
+
+    stat = os.stat(shared_datadir / "api.yaml")
+    os.utime(
+        shared_datadir / "api.yaml", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9)
+    )
+
+    assert ModelMetadata.load(shared_datadir) is not meta
+
+
+def test_cache_is_bounded(tmp_path, shared_datadir, cache):
+    paths = []
+    for n in range(3):
+        path = tmp_path / f"model-{n}"
+        path.mkdir()
+        for fname in ("api.yaml", "info.yaml"):
+            (path / fname).write_text((shared_datadir / fname).read_text())
+        paths.append(path)
+
+    for path in paths:
+        ModelMetadata.load(path)
+    assert len(cache) == 2
+
+    ModelMetadata.load(paths[0])
+    assert cache.info().misses == 4
+
+
+def test_cache_clear(shared_datadir, cache):
+    meta = ModelMetadata.load(shared_datadir)
+    ModelMetadata.load(shared_datadir)
+
+    cache.clear()
+    assert cache.info() == (0, 0, 2, 0)
+    assert ModelMetadata.load(shared_datadir) is not meta
+
+
+def test_cache_not_found(tmp_path, cache):
+    with pytest.raises(MetadataNotFoundError):
+        ModelMetadata.load(tmp_path)
+    assert len(cache) == 0
+
+
+def test_metadata_signature(shared_datadir):
+    signature = metadata_signature(str(shared_datadir))
+    assert [os.path.basename(fname) for fname, _, _ in signature] == [
+        "api.yaml",
+        "info.yaml",
+        "parameters.yaml",
+        "run.yaml",
+    ]
+
+
+def test_cache_bad_maxsize():
+    with pytest.raises(ValueError):
+        MetadataCache(maxsize=0)
+
+
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    disk_cache = DiskCache(str(tmp_path / "cache"))
+    monkeypatch.setattr(ModelMetadata, "disk_cache", disk_cache)
+    return disk_cache
+
+
+def test_disk_cache_skips_loading(shared_datadir, disk_cache, monkeypatch):
+    expected = ModelMetadata(shared_datadir).meta
+    assert len(os.listdir(disk_cache.directory)) == 1
+
+    def _load_all(self):
+        raise AssertionError("metadata should have been read from the cache")
+
+    monkeypatch.setattr(ModelMetadata, "load_all", _load_all)
+    assert ModelMetadata(shared_datadir).meta == expected
+
+
+def test_disk_cache_invalidated_on_change(shared_datadir, disk_cache):
+    assert ModelMetadata(shared_datadir).info["version"] == "10.6"
+
+    path_to_info = shared_datadir / "info.yaml"
+    path_to_info.write_text(path_to_info.read_text().replace('"10.6"', '"10.7"'))
+
+    assert ModelMetadata(shared_datadir).info["version"] == "10.7"
+    assert len(os.listdir(disk_cache.directory)) == 1
+
+
+def test_disk_cache_keeps_other_folders(tmp_path, shared_datadir, disk_cache):
+    other_datadir = shutil.copytree(shared_datadir, tmp_path / "other")
+    ModelMetadata(shared_datadir)
+    ModelMetadata(other_datadir)
+    assert len(os.listdir(disk_cache.directory)) == 2
+
+    (other_datadir / "run.yaml").write_text("config_file: foo.in\n")
+    ModelMetadata(other_datadir)
+    assert len(os.listdir(disk_cache.directory)) == 2
+    assert disk_cache.get(disk_cache.key(str(shared_datadir))) is not None
+
+
+def test_disk_cache_hit_warns_about_private_parameters(shared_datadir, disk_cache):
+    with open(shared_datadir / "parameters.yaml", "a") as fp:
+        fp.write("_private:\n  value: 1\n")
+
+    for _ in range(2):
+        with pytest.warns(UserWarning, match="_private: ignoring private attribute"):
+            meta = ModelMetadata(shared_datadir)
+        assert "_private" not in meta.parameters
+    assert len(os.listdir(disk_cache.directory)) == 1
+
+
+def test_disk_cache_ignores_entries_of_the_wrong_shape(shared_datadir, disk_cache):
+    expected = ModelMetadata(shared_datadir).meta
+    disk_cache.put(disk_cache.key(str(shared_datadir)), {"info": {}})
+
+    assert ModelMetadata(shared_datadir).meta == expected
+
+
+def test_disk_cache_ignores_corrupt_entries(shared_datadir, disk_cache):
+    expected = ModelMetadata(shared_datadir).meta
+    for fname in os.listdir(disk_cache.directory):
+        with open(os.path.join(disk_cache.directory, fname), "wb") as fp:
+            fp.write(b"not marshal data")
+
+    assert ModelMetadata(shared_datadir).meta == expected
+
+
+def test_disk_cache_clear(shared_datadir, disk_cache):
+    ModelMetadata(shared_datadir)
+    disk_cache.clear()
+    assert os.listdir(disk_cache.directory) == []
+
+
+def test_disk_cache_round_trip(tmp_path):
+    disk_cache = DiskCache(str(tmp_path))
+    value = {"a": (1, 2.5, None), "b": {"c": True, "d": "e"}}
+
+    disk_cache.put("abc-def", value)
+    assert disk_cache.get("abc-def") == value
+    assert isinstance(disk_cache.get("abc-def")["a"], tuple)
+
+
+def test_disk_cache_does_not_unpickle(tmp_path):
+    disk_cache = DiskCache(str(tmp_path))
+    with open(os.path.join(tmp_path, "abc-def.marshal"), "wb") as fp:
+        pickle.dump(Exploit(), fp)
+
+    assert disk_cache.get("abc-def") is None
+
+
+def test_disk_cache_skips_unmarshallable(tmp_path):
+    disk_cache = DiskCache(str(tmp_path))
+    disk_cache.put("abc-def", {"a": object()})
+    assert disk_cache.get("abc-def") is None
+
+
+def test_disk_cache_key(shared_datadir, tmp_path):
+    disk_cache = DiskCache(str(tmp_path))
+    key = disk_cache.key(str(shared_datadir))
+    assert key == disk_cache.key(str(shared_datadir))
+
+    (shared_datadir / "run.yaml").write_text("config_file: foo.in\n")
+    assert disk_cache.key(str(shared_datadir)) != key
+
+
+@pytest.mark.parametrize("value", ("", "0"))
+def test_disk_cache_from_env_disabled(monkeypatch, value):
+    monkeypatch.setenv("MODEL_METADATA_DISK_CACHE", value)
+    assert DiskCache.from_env() is None
+
+
+def test_disk_cache_from_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setenv("MODEL_METADATA_DISK_CACHE", "1")
+    assert DiskCache.from_env().directory == str(tmp_path / "model_metadata")
+
+    monkeypatch.setenv("MODEL_METADATA_DISK_CACHE", str(tmp_path / "foo"))
+    assert DiskCache.from_env().directory == str(tmp_path / "foo")
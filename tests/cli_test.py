@@ -2,10 +2,14 @@
 from __future__ import annotations
 
 import contextlib
+import json
 import os
 import pathlib
+import shutil
 
 import pytest
+import yaml
+from model_metadata.main import _parse_value
 from model_metadata.main import main
 
 
@@ -25,7 +29,7 @@ def test_cli_help(capsys):
     assert "usage" in output
 
 
-@pytest.mark.parametrize("subcommand", ("find", "query", "stage"))
+@pytest.mark.parametrize("subcommand", ("find", "query", "stage", "index"))
 def test_subcommand_help(capsys, subcommand):
     with contextlib.suppress(SystemExit):
         assert main([subcommand, "--help"]) == 0
@@ -42,12 +46,196 @@ def test_stage_subcommand(capsys, tmpdir, shared_datadir):
         assert set(stagedir.iterdir()) == {stagedir / fname for fname in manifest}
 
 
+@pytest.mark.parametrize("link_mode", ("copy", "hardlink", "symlink", "reflink"))
+def test_stage_subcommand_link_mode(capsys, tmp_path, shared_datadir, link_mode):
+    with contextlib.suppress(SystemExit):
+        assert (
+            main(
+                [
+                    "stage",
+                    f"--link-mode={link_mode}",
+                    str(shared_datadir),
+                    str(tmp_path),
+                ]
+            )
+            == 0
+        )
+    assert capsys.readouterr().out.splitlines() == ["child.in"]
+
+
+def test_stage_subcommand_incremental(capsys, tmp_path, shared_datadir):
+    for _ in range(2):
+        with contextlib.suppress(SystemExit):
+            assert (
+                main(["stage", "--incremental", str(shared_datadir), str(tmp_path)])
+                == 0
+            )
+        assert capsys.readouterr().out.splitlines() == ["child.in"]
+
+
+@pytest.mark.parametrize("jobs", ("1", "2"))
+def test_stage_subcommand_ensemble(capsys, tmp_path, shared_datadir, jobs):
+    path_to_csv = tmp_path / "ensemble.csv"
+    path_to_csv.write_text("run_duration,grid_x_size\n100,\n200,1000.5\n")
+    pattern = str(tmp_path / "run-{index}")
+
+    with contextlib.suppress(SystemExit):
+        assert (
+            main(
+                [
+                    "stage",
+                    "--ensemble",
+                    str(path_to_csv),
+                    "--jobs",
+                    jobs,
+                    str(shared_datadir),
+                    pattern,
+                ]
+            )
+            == 0
+        )
+    manifest = capsys.readouterr().out.splitlines()
+
+    assert (tmp_path / "run-0").is_dir() and (tmp_path / "run-1").is_dir()
+    assert set(manifest) == {
+        str(tmp_path / f"run-{index}" / fname)
+        for index in range(2)
+        for fname in os.listdir(tmp_path / f"run-{index}")
+    }
+
+
+def test_stage_subcommand_ensemble_keeps_strings(tmp_path, shared_datadir):
+    with open(shared_datadir / "parameters.yaml", "a") as fp:
+        fp.write("label:\n  value:\n    type: string\n    default: a\n")
+    with open(shared_datadir / "child.in", "a") as fp:
+        fp.write("LABEL: {{ label }}\n")
+    path_to_csv = tmp_path / "ensemble.csv"
+    path_to_csv.write_text("label,run_duration,uplift_type\n007,100,1\n1e3,2e2,\n")
+
+    assert (
+        main(
+            [
+                "stage",
+                "--ensemble",
+                str(path_to_csv),
+                str(shared_datadir),
+                str(tmp_path / "run-{index}"),
+            ]
+        )
+        == 0
+    )
+
+    for index, label in enumerate(("007", "1e3")):
+        contents = (tmp_path / f"run-{index}" / "child.in").read_text()
+        assert contents.rstrip().endswith(f"LABEL: {label}")
+    assert "\n100.0\n" in (tmp_path / "run-0" / "child.in").read_text()
+    assert "\n200.0\n" in (tmp_path / "run-1" / "child.in").read_text()
+
+
+@pytest.mark.parametrize(
+    "dtype,choices,value,expected",
+    (
+        ("int", None, "007", 7),
+        ("float", None, "1e3", 1000.0),
+        ("str", None, "1e3", "1e3"),
+        ("str", (0, 1, 2), "1", "1"),
+        ("bool", (True, False), "false", False),
+        ("bool", ("yes", "no"), "yes", "yes"),
+    ),
+)
+def test_parse_ensemble_value(dtype, choices, value, expected):
+    parameter = {"value": {"type": dtype, "default": None}}
+    if choices is not None:
+        parameter["value"]["choices"] = choices
+
+    actual = _parse_value(value, parameter)
+    assert actual == expected
+    assert type(actual) is type(expected)
+    assert _parse_value(value, None) == value
+
+
+def test_stage_subcommand_ensemble_bad_value(capsys, tmp_path, shared_datadir):
+    path_to_csv = tmp_path / "ensemble.csv"
+    path_to_csv.write_text("run_duration\n100\nlong\n")
+
+    assert (
+        main(
+            [
+                "stage",
+                "--ensemble",
+                str(path_to_csv),
+                str(shared_datadir),
+                str(tmp_path / "run-{index}"),
+            ]
+        )
+        == 1
+    )
+    captured = capsys.readouterr()
+    assert "line 3, column 'run_duration'" in captured.err
+    assert not list(tmp_path.glob("run-*"))
+
+
+@pytest.mark.parametrize("pattern", ("run-{0}", "run-{not_a_parameter}"))
+def test_stage_subcommand_ensemble_bad_pattern(
+    capsys, tmp_path, shared_datadir, pattern
+):
+    path_to_csv = tmp_path / "ensemble.csv"
+    path_to_csv.write_text("run_duration\n100\n200\n")
+
+    assert (
+        main(
+            [
+                "stage",
+                "--ensemble",
+                str(path_to_csv),
+                str(shared_datadir),
+                str(tmp_path / pattern),
+            ]
+        )
+        == 1
+    )
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "unable to format destination pattern" in captured.err
+    assert "Traceback" not in captured.err
+    assert not list(tmp_path.glob("run-*"))
+
+
 def test_query_subcommand(capsys, shared_datadir):
     with contextlib.suppress(SystemExit):
         assert main(["query", "-vvv", "--var=info.version", str(shared_datadir)]) == 0
     assert capsys.readouterr().out.strip() == "info.version: '10.6'"
 
 
+def test_query_subcommand_many_vars(capsys, shared_datadir):
+    with contextlib.suppress(SystemExit):
+        assert (
+            main(
+                [
+                    "query",
+                    "--var",
+                    "info.version",
+                    "info.name",
+                    "--",
+                    str(shared_datadir),
+                ]
+            )
+            == 0
+        )
+    assert capsys.readouterr().out.strip().splitlines() == [
+        "info.name: child",
+        "info.version: '10.6'",
+    ]
+
+
+def test_query_subcommand_all(capsys, shared_datadir):
+    with contextlib.suppress(SystemExit):
+        assert main(["query", "--all", str(shared_datadir)]) == 0
+    output = capsys.readouterr().out
+    for section in ("api:", "info:", "parameters:", "run:"):
+        assert section in output
+
+
 def test_query_subcommand_missing_values(capsys, shared_datadir):
     with contextlib.suppress(SystemExit):
         assert main(["query", "-vvv", "--var=not-a-section"]) == 1
@@ -70,3 +258,187 @@ def test_find_absolute_path(capsys, datadir):
         assert main(["find", "-vvv", "testing.model:ModelAbsolutePath"]) == 0
     actual = pathlib.PurePath(capsys.readouterr().out.strip())
     assert actual.stem == ""
+
+
+@pytest.mark.parametrize("jobs", ("1", "2"))
+def test_find_many(capsys, jobs):
+    entry_points = ["testing.model:ModelString", "testing.model:ModelPath"]
+    with contextlib.suppress(SystemExit):
+        assert main(["find", "--format=json", f"--jobs={jobs}", *entry_points]) == 0
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted(record["model"] for record in records) == sorted(entry_points)
+    for record in records:
+        assert os.path.isfile(os.path.join(record["path"], "model.py"))
+
+
+def test_find_many_with_errors(capsys):
+    with contextlib.suppress(SystemExit):
+        assert (
+            main(["find", "testing.model:ModelString", "testing.model:NotAModel"]) == 1
+        )
+    assert len(list(yaml.safe_load_all(capsys.readouterr().out))) == 1
+
+
+def test_find_many_keeps_going_after_error(capsys, tmp_path, monkeypatch):
+    (tmp_path / "broken_model.py").write_text("raise RuntimeError('broken')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    with contextlib.suppress(SystemExit):
+        assert main(["find", "broken_model:Model", "testing.model:ModelString"]) == 1
+    documents = list(yaml.safe_load_all(capsys.readouterr().out))
+    assert [doc["model"] for doc in documents] == ["testing.model:ModelString"]
+
+
+@pytest.fixture
+def grids_datadir(shared_datadir):
+    with open(shared_datadir / "api.yaml", "a") as fp:
+        fp.write("grids:\n  - {id: 0, type: uniform_rectilinear}\n  - {id: 1}\n")
+    return shared_datadir
+
+
+@pytest.mark.parametrize("jobs", ("1", "2"))
+def test_query_many_with_list_of_mappings(capsys, tmp_path, grids_datadir, jobs):
+    other_datadir = shutil.copytree(grids_datadir, tmp_path / "other")
+
+    with contextlib.suppress(SystemExit):
+        assert (
+            main(
+                [
+                    "query",
+                    f"--jobs={jobs}",
+                    "--var=api",
+                    "--",
+                    str(grids_datadir),
+                    str(other_datadir),
+                ]
+            )
+            == 0
+        )
+
+    documents = list(yaml.safe_load_all(capsys.readouterr().out))
+    assert len(documents) == 2
+    for document in documents:
+        assert document["values"]["api"]["grids"] == [
+            {"id": 0, "type": "uniform_rectilinear"},
+            {"id": 1},
+        ]
+
+
+def test_query_list_of_mappings_as_json(capsys, grids_datadir):
+    with contextlib.suppress(SystemExit):
+        assert (
+            main(["query", "--var=api.grids", "--format=json", str(grids_datadir)]) == 0
+        )
+
+    record = json.loads(capsys.readouterr().out)
+    assert record["values"]["api.grids"] == [
+        {"id": 0, "type": "uniform_rectilinear"},
+        {"id": 1},
+    ]
+
+
+@pytest.mark.parametrize("jobs", ("1", "2"))
+def test_query_many_keeps_going_after_error(capsys, tmp_path, shared_datadir, jobs):
+    bad_datadir = shutil.copytree(shared_datadir, tmp_path / "bad")
+    parameters = bad_datadir / "parameters.yaml"
+    parameters.write_text(
+        parameters.read_text().replace("default: 5000.", "default: -5000.")
+    )
+
+    with contextlib.suppress(SystemExit):
+        assert (
+            main(
+                [
+                    "query",
+                    f"--jobs={jobs}",
+                    "--var=info.name",
+                    "--",
+                    str(bad_datadir),
+                    str(shared_datadir),
+                ]
+            )
+            == 1
+        )
+
+    documents = list(yaml.safe_load_all(capsys.readouterr().out))
+    assert sorted(documents, key=lambda doc: doc["model"]) == [
+        {"model": str(bad_datadir), "values": {}},
+        {"model": str(shared_datadir), "values": {"info.name": "child"}},
+    ]
+
+
+@pytest.mark.parametrize("jobs", ("1", "2"))
+def test_query_many_models(capsys, tmp_path, shared_datadir, jobs):
+    other_datadir = shutil.copytree(shared_datadir, tmp_path / "other")
+    (other_datadir / "info.yaml").write_text("name: other\nversion: '1.0'\n")
+
+    with contextlib.suppress(SystemExit):
+        assert (
+            main(
+                [
+                    "query",
+                    f"--jobs={jobs}",
+                    "--var=info.version",
+                    str(shared_datadir),
+                    str(other_datadir),
+                ]
+            )
+            == 0
+        )
+
+    documents = list(yaml.safe_load_all(capsys.readouterr().out))
+    assert sorted(documents, key=lambda doc: doc["model"]) == sorted(
+        [
+            {"model": str(shared_datadir), "values": {"info.version": "10.6"}},
+            {"model": str(other_datadir), "values": {"info.version": "1.0"}},
+        ],
+        key=lambda doc: doc["model"],
+    )
+
+
+@pytest.mark.parametrize("jobs", ("1", "2"))
+def test_query_section_json(capsys, tmp_path, shared_datadir, jobs):
+    other_datadir = shutil.copytree(shared_datadir, tmp_path / "other")
+
+    with contextlib.suppress(SystemExit):
+        assert (
+            main(
+                [
+                    "query",
+                    "--format=json",
+                    f"--jobs={jobs}",
+                    "--var=run",
+                    str(shared_datadir),
+                    str(other_datadir),
+                ]
+            )
+            == 0
+        )
+
+    for line in capsys.readouterr().out.splitlines():
+        assert json.loads(line)["values"] == {
+            "run": {"config_file": {"path": "child.in", "contents": None}}
+        }
+
+
+def test_query_json(capsys, shared_datadir):
+    with contextlib.suppress(SystemExit):
+        assert (
+            main(
+                [
+                    "query",
+                    "--format=json",
+                    "--var",
+                    "info.version",
+                    "info.not_a_value",
+                    "--",
+                    str(shared_datadir),
+                ]
+            )
+            == 1
+        )
+    assert json.loads(capsys.readouterr().out) == {
+        "model": str(shared_datadir),
+        "values": {"info.version": "10.6"},
+    }
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+IMPORT_BUDGET_US = 150_000
+HEAVY_MODULES = ("yaml", "jinja2", "packaging", "importlib_resources")
+
+
+def _importtime(code: str) -> dict[str, int]:
+    """Run code in a fresh interpreter and return cumulative import times."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, total, name = line.split("|")
+        cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+@pytest.mark.parametrize(
+    "code",
+    (
+        "import model_metadata",
+        "import model_metadata.modelmetadata",
+        "from model_metadata.main import main",
+    ),
+)
+def test_import_does_not_load_heavy_modules(code):
+    imported = _importtime(code)
+    assert not [
+        name for name in imported if name.split(".")[0] in HEAVY_MODULES
+    ], f"{code!r} should not import {', '.join(HEAVY_MODULES)}"
+
+
+def test_import_time_budget():
+    imported = _importtime("import model_metadata")
+    assert imported["model_metadata"] < IMPORT_BUDGET_US
+
+
+def test_cli_version_does_not_load_heavy_modules():
+    imported = _importtime(
+        "import contextlib\n"
+        "from model_metadata.main import main\n"
+        "with contextlib.suppress(SystemExit):\n"
+        "    main(['--version'])\n"
+    )
+    assert "model_metadata.main" in imported
+    assert not [name for name in imported if name.split(".")[0] in HEAVY_MODULES]
+
+
+def test_lazy_attributes():
+    import model_metadata
+
+    assert model_metadata.ModelMetadata.__name__ == "ModelMetadata"
+    assert model_metadata.ModelInfo.__name__ == "ModelInfo"
+    assert model_metadata.MetadataNotFoundError.__name__ == "MetadataNotFoundError"
+    assert set(model_metadata.__all__) <= set(dir(model_metadata))
+
+    with pytest.raises(AttributeError):
+        model_metadata.not_an_attribute
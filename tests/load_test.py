@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+from model_metadata import load
+from model_metadata import ModelMetadata
+from model_metadata.load import load_meta
+from model_metadata.load import load_meta_section
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    _load_yaml_file = load._load_yaml_file
+    opened = []
+
+    def _counting_load_yaml_file(file_like):
+        opened.append(os.path.basename(file_like))
+        return _load_yaml_file(file_like)
+
+    monkeypatch.setattr(load, "_load_yaml_file", _counting_load_yaml_file)
+    return opened
+
+
+@pytest.fixture
+def combined_datadir(tmp_path, shared_datadir):
+    sections = []
+    for section in ModelMetadata.SECTIONS:
+        contents = (shared_datadir / f"{section}.yaml").read_text()
+        sections.append(
+            f"{section}:\n" + "".join(f"  {line}\n" for line in contents.splitlines())
+        )
+    (tmp_path / "meta.yaml").write_text("".join(sections))
+    return tmp_path
+
+
+def test_load_meta_matches_load_meta_section(shared_datadir):
+    loaded = load_meta(str(shared_datadir), ModelMetadata.SECTIONS)
+    assert loaded == {
+        section: load_meta_section(str(shared_datadir), section)
+        for section in ModelMetadata.SECTIONS
+    }
+
+
+def test_load_meta_from_combined_file(combined_datadir, shared_datadir, opened):
+    loaded = load_meta(str(combined_datadir), ModelMetadata.SECTIONS)
+
+    assert opened == ["meta.yaml"]
+    assert loaded == load_meta(str(shared_datadir), ModelMetadata.SECTIONS)
+
+
+def test_load_meta_falls_back_to_section_files(shared_datadir, opened):
+    (shared_datadir / "meta.yaml").write_text("run:\n  config_file: foo.in\n")
+
+    loaded = load_meta(str(shared_datadir), ModelMetadata.SECTIONS)
+
+    assert opened == ["meta.yaml", "api.yaml", "info.yaml", "parameters.yaml"]
+    assert loaded["run"] == {"config_file": "foo.in"}
+    assert loaded["info"]["version"] == "10.6"
+
+
+def test_load_meta_missing_section(tmp_path):
+    assert load_meta(str(tmp_path), ("api", "info")) == {"api": {}, "info": {}}
+
+
+def test_model_metadata_reads_meta_once(shared_datadir, opened):
+    ModelMetadata(shared_datadir)
+    assert opened.count("meta.yaml") == 1
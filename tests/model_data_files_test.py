@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import os
+import tracemalloc
+
+import pytest
+from model_metadata import model_data_files
+from model_metadata.model_data_files import CompiledTemplate
+from model_metadata.model_data_files import FileTemplate
+from model_metadata.model_data_files import format_template_file
+from model_metadata.model_data_files import iter_template_chunks
+from model_metadata.model_data_files import SafeFormatter
+from model_metadata.model_data_files import sub_parameters
+
+TEMPLATES = (
+    "",
+    "no fields\nat all\n",
+    "{foo}\n{bar}\n",
+    "RUNTIME: {run_duration}\nSTEP: {time_step:.2f}\n",
+    "missing: {not_a_param}\n",
+    "bad spec: {foo:d}\n",
+    "escaped: {{foo}}\n}}\n{{\n",
+    "nested spec: {run_duration:{width}}\n",
+    "field across lines: {foo\n}\n{bar}\n",
+    "opening brace at end of line {\n{foo}}\nmore\n",
+    "attribute: {foo.bar} index: {foo[0]}\n",
+    "no trailing newline {foo}",
+    "conversions: {foo!r} {bar!s:>8} {not_a_param!r}\n",
+    "deeply nested: {run_duration:{width:{foo}}}\n",
+    "too deeply nested: {run_duration:{width:{foo:{bar}}}}\n",
+    "positional: {} {0}\n",
+    "single brace: }\n",
+    "unclosed: {foo\n",
+    "bad conversion: {foo!x}\n",
+    "float with int spec: {bar:d}\n",
+)
+PARAMS = {"foo": "FOO", "bar": 1.5, "run_duration": 100, "time_step": 0.25, "width": 8}
+
+
+@pytest.mark.parametrize("template", TEMPLATES)
+@pytest.mark.parametrize("chunk_size", (1, 10, 65536))
+def test_chunked_format_matches_format(template, chunk_size):
+    formatter = SafeFormatter()
+    try:
+        expected = formatter.format(template, **PARAMS)
+    except Exception as error:
+        expected = type(error)
+
+    try:
+        actual = "".join(
+            formatter.format(chunk, **PARAMS)
+            for chunk in iter_template_chunks(
+                template.splitlines(keepends=True), chunk_size=chunk_size
+            )
+        )
+    except Exception as error:
+        actual = type(error)
+
+    assert actual == expected
+
+
+def test_chunks_break_between_fields():
+    lines = ["a\n", "{foo\n", "}\n", "b\n"]
+    assert list(iter_template_chunks(lines, chunk_size=1)) == [
+        "a\n",
+        "{foo\n}\n",
+        "b\n",
+    ]
+
+
+@pytest.mark.parametrize("template", TEMPLATES)
+def test_stream_matches_render(tmp_path, template):
+    (tmp_path / "input.txt").write_text(template)
+    file_template = FileTemplate(str(tmp_path / "input.txt"))
+
+    expected = _outcome(SafeFormatter().format, template, **PARAMS)
+    assert _outcome(file_template.render, **PARAMS) == expected
+    assert _outcome(lambda: "".join(file_template.stream(**PARAMS))) == expected
+
+
+@pytest.fixture
+def large_template(tmp_path):
+    path = tmp_path / "grid.txt.tmpl"
+    row = " ".join(["1.0"] * 100) + "\n"
+    with open(path, "w") as fp:
+        fp.write("NROWS: {nrows}\n")
+        for _ in range(20000):
+            fp.write(row)
+        fp.write("END: {nrows}\n")
+    return path
+
+
+def _peak_memory(func, *args, **kwds):
+    tracemalloc.start()
+    try:
+        func(*args, **kwds)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_to_file_memory_is_bounded(tmp_path, large_template):
+    size = large_template.stat().st_size
+    dest = str(tmp_path / "output") + "/"
+
+    peak = _peak_memory(FileTemplate(str(large_template)).to_file, dest, nrows=20000)
+
+    output = (tmp_path / "output" / "grid.txt").read_text()
+    assert output.startswith("NROWS: 20000\n")
+    assert output.endswith("END: 20000\n")
+    assert len(output) == size + 2 * (len("20000") - len("{nrows}"))
+    assert peak < size / 4
+
+
+def test_format_template_file_memory_is_bounded(tmp_path, large_template):
+    size = large_template.stat().st_size
+    dest = tmp_path / "grid.txt"
+
+    peak = _peak_memory(
+        format_template_file, str(large_template), str(dest), nrows=20000
+    )
+
+    assert dest.read_text().endswith("END: 20000\n")
+    assert peak < size / 4
+
+
+def _outcome(func, *args, **kwds):
+    try:
+        return func(*args, **kwds)
+    except Exception as error:
+        return type(error)
+
+
+@pytest.mark.parametrize("template", TEMPLATES)
+def test_compiled_template_matches_formatter(template):
+    expected = _outcome(SafeFormatter().format, template, **PARAMS)
+    assert _outcome(CompiledTemplate(template).render, **PARAMS) == expected
+    assert _outcome(sub_parameters, template, **PARAMS) == expected
+
+
+@pytest.mark.parametrize("template", TEMPLATES)
+def test_compiled_template_with_no_parameters(template):
+    expected = _outcome(SafeFormatter().format, template)
+    assert _outcome(CompiledTemplate(template).render) == expected
+
+
+def test_compiled_template_renders_many_times():
+    template = CompiledTemplate("RUNTIME: {run_duration}\n")
+    assert [template.render(run_duration=n) for n in range(3)] == [
+        "RUNTIME: 0\n",
+        "RUNTIME: 1\n",
+        "RUNTIME: 2\n",
+    ]
+
+
+def test_file_template_is_compiled_once(tmp_path, monkeypatch):
+    compiled = []
+    _compile = CompiledTemplate._compile.__func__
+
+    def _counting_compile(cls, format_string, recursion_depth):
+        if recursion_depth == 2:
+            compiled.append(format_string)
+        return _compile(cls, format_string, recursion_depth)
+
+    monkeypatch.setattr(CompiledTemplate, "_compile", classmethod(_counting_compile))
+    model_data_files._compiled.clear()
+
+    path = tmp_path / "input.txt"
+    path.write_text("RUNTIME: {run_duration}\n")
+    for n in range(3):
+        assert FileTemplate(str(path)).render(run_duration=n) == f"RUNTIME: {n}\n"
+    assert compiled == ["RUNTIME: {run_duration}\n"]
+
+    path.write_text("DURATION: {run_duration}\n")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert FileTemplate(str(path)).render(run_duration=1) == "DURATION: 1\n"
+    assert len(compiled) == 2
+
+
+def test_large_file_template_is_streamed(tmp_path, monkeypatch):
+    monkeypatch.setattr(FileTemplate, "MAX_COMPILED_SIZE", 16)
+    path = tmp_path / "input.txt"
+    path.write_text("".join(f"{n}: {{foo}}\n" for n in range(10000)))
+
+    chunks = list(FileTemplate(str(path)).stream(foo="bar"))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == "".join(f"{n}: bar\n" for n in range(10000))
+
+
+def _retained_memory(func, *args, **kwds):
+    tracemalloc.start()
+    try:
+        func(*args, **kwds)
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def test_large_strings_are_not_cached(monkeypatch):
+    monkeypatch.setattr(FileTemplate, "MAX_COMPILED_SIZE", 1024)
+    model_data_files._compiled.clear()
+    template = "".join(f"{n}: {{foo}}\n" for n in range(10000))
+
+    retained = _retained_memory(sub_parameters, template, foo="bar")
+
+    assert len(model_data_files._compiled) == 0
+    assert retained < len(template) / 4
+    assert sub_parameters("{foo}", foo="bar") == "bar"
+    assert len(model_data_files._compiled) == 1
+
+
+def test_compiled_template_cache_is_bounded_by_size():
+    templates = [CompiledTemplate(f"{n}: {{foo}}\n" * 100) for n in range(10)]
+    cache = model_data_files._CompiledTemplateCache(max_nbytes=3 * templates[0].nbytes)
+
+    for n, template in enumerate(templates):
+        assert cache.get(n, lambda template=template: template) is template
+    assert len(cache) == 3
+    assert cache.nbytes <= 3 * templates[0].nbytes
+
+    assert cache.get(9, lambda: None) is templates[9]
+    assert cache.get(0, lambda: templates[0]) is templates[0]
+    assert len(cache) == 3
+
+
+def test_compiled_template_cache_skips_oversized():
+    cache = model_data_files._CompiledTemplateCache(max_nbytes=16)
+    template = CompiledTemplate("{foo} " * 100)
+
+    assert cache.get("big", lambda: template) is template
+    assert len(cache) == 0
+    assert cache.nbytes == 0
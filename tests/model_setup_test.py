@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import os
+
+import jinja2
+import pytest
+from model_metadata import model_setup
+from model_metadata.model_setup import FileSystemLoader
+from model_metadata.model_setup import OldFileSystemLoader
+from model_metadata.model_setup import StageManifest
+
+
+@pytest.fixture
+def compiled(monkeypatch):
+    compile_ = jinja2.Environment.compile
+    compiled = []
+
+    def _compile(self, source, name=None, filename=None, *args, **kwds):
+        compiled.append(name)
+        return compile_(self, source, name, filename, *args, **kwds)
+
+    monkeypatch.setattr(jinja2.Environment, "compile", _compile)
+    return compiled
+
+
+def test_environment_is_shared(shared_datadir):
+    env = FileSystemLoader(str(shared_datadir)).environment
+    assert FileSystemLoader(str(shared_datadir)).environment is env
+    assert (
+        FileSystemLoader(str(shared_datadir), bytecode_cache_dir=None).environment
+        is env
+    )
+
+
+def test_templates_compiled_once(tmp_path, shared_datadir, compiled):
+    for n in range(3):
+        FileSystemLoader(str(shared_datadir)).stage_all(
+            str(tmp_path / f"run-{n}"), run_duration=n
+        )
+        with open(tmp_path / f"run-{n}" / "child.in") as fp:
+            assert f"RUNTIME: Duration of run (years)\n{n}\n" in fp.read()
+
+    assert compiled == ["child.in"]
+
+
+def test_changed_template_is_recompiled(tmp_path, shared_datadir, compiled):
+    loader = FileSystemLoader(str(shared_datadir))
+    loader.stage_all(str(tmp_path / "run-0"), run_duration=1)
+
+    path_to_template = shared_datadir / "child.in"
+    path_to_template.write_text("RUNTIME: {{ run_duration }}\n")
+    stat = os.stat(path_to_template)
+    os.utime(path_to_template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    loader.stage_all(str(tmp_path / "run-1"), run_duration=2)
+
+    assert compiled == ["child.in", "child.in"]
+    assert (tmp_path / "run-1" / "child.in").read_text() == "RUNTIME: 2"
+
+
+def test_bytecode_cache(tmp_path, shared_datadir):
+    bytecode_cache_dir = tmp_path / "bytecode"
+    loader = FileSystemLoader(
+        str(shared_datadir), bytecode_cache_dir=str(bytecode_cache_dir)
+    )
+    assert loader.environment is not FileSystemLoader(str(shared_datadir)).environment
+
+    loader.stage_all(str(tmp_path / "run"), run_duration=1)
+    assert len(os.listdir(bytecode_cache_dir)) == 1
+
+
+@pytest.fixture
+def datadir_with_binary(shared_datadir):
+    (shared_datadir / "grid.bin").write_bytes(bytes(range(256)) * 16)
+    return shared_datadir
+
+
+@pytest.mark.parametrize("cls", (FileSystemLoader, OldFileSystemLoader))
+def test_incremental_skips_unchanged(tmp_path, datadir_with_binary, cls):
+    loader = cls(str(datadir_with_binary), incremental=True)
+
+    manifest = loader.stage_all(str(tmp_path), run_duration=1)
+    assert isinstance(manifest, StageManifest)
+    assert sorted(manifest) == ["child.in", "grid.bin"]
+    assert manifest.skipped == ()
+    assert manifest.written == manifest
+
+    manifest = loader.stage_all(str(tmp_path), run_duration=1)
+    assert sorted(manifest.skipped) == ["child.in", "grid.bin"]
+    assert manifest.written == ()
+
+
+@pytest.mark.parametrize("cls", (FileSystemLoader, OldFileSystemLoader))
+def test_incremental_writes_changed(tmp_path, datadir_with_binary, cls):
+    loader = cls(str(datadir_with_binary), incremental=True)
+    loader.stage_all(str(tmp_path), run_duration=1)
+
+    (datadir_with_binary / "grid.bin").write_bytes(b"\x00\x01")
+    stat = os.stat(datadir_with_binary / "grid.bin")
+    os.utime(
+        datadir_with_binary / "grid.bin",
+        ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9),
+    )
+
+    manifest = loader.stage_all(str(tmp_path), run_duration=1)
+    assert manifest.written == ("grid.bin",)
+    assert manifest.skipped == ("child.in",)
+    assert (tmp_path / "grid.bin").read_bytes() == b"\x00\x01"
+
+
+def test_incremental_rewrites_changed_text(tmp_path, datadir_with_binary):
+    loader = FileSystemLoader(str(datadir_with_binary), incremental=True)
+    loader.stage_all(str(tmp_path), run_duration=1)
+
+    manifest = loader.stage_all(str(tmp_path), run_duration=2)
+    assert manifest.written == ("child.in",)
+    assert (
+        "RUNTIME: Duration of run (years)\n2\n" in (tmp_path / "child.in").read_text()
+    )
+
+
+def test_not_incremental_writes_everything(tmp_path, datadir_with_binary):
+    loader = FileSystemLoader(str(datadir_with_binary))
+    loader.stage_all(str(tmp_path), run_duration=1)
+
+    manifest = loader.stage_all(str(tmp_path), run_duration=1)
+    assert manifest.skipped == ()
+    assert sorted(manifest.written) == ["child.in", "grid.bin"]
+
+
+@pytest.mark.parametrize("cls", (FileSystemLoader, OldFileSystemLoader))
+@pytest.mark.parametrize("link_mode", ("hardlink", "symlink"))
+def test_link_mode(tmp_path, datadir_with_binary, cls, link_mode):
+    loader = cls(str(datadir_with_binary), link_mode=link_mode)
+    loader.stage_all(str(tmp_path), run_duration=1)
+
+    assert os.path.samefile(tmp_path / "grid.bin", datadir_with_binary / "grid.bin")
+    assert not os.path.samefile(tmp_path / "child.in", datadir_with_binary / "child.in")
+
+
+def test_link_mode_incremental(tmp_path, datadir_with_binary):
+    loader = FileSystemLoader(
+        str(datadir_with_binary), incremental=True, link_mode="hardlink"
+    )
+    loader.stage_all(str(tmp_path), run_duration=1)
+    manifest = loader.stage_all(str(tmp_path), run_duration=1)
+    assert "grid.bin" in manifest.skipped
+
+
+def test_bad_link_mode(shared_datadir):
+    with pytest.raises(ValueError):
+        FileSystemLoader(str(shared_datadir), link_mode="teleport")
+
+
+@pytest.fixture
+def no_chdir(monkeypatch):
+    def _chdir(path):
+        raise AssertionError("staging should not change the working directory")
+
+    monkeypatch.setattr(os, "chdir", _chdir)
+
+
+@pytest.mark.parametrize("cls", (FileSystemLoader, OldFileSystemLoader))
+def test_stage_all_does_not_chdir(tmp_path, datadir_with_binary, cls, no_chdir):
+    (datadir_with_binary / "inputs").mkdir()
+    (datadir_with_binary / "inputs" / "forcing.txt").write_text("{run_duration}\n")
+
+    manifest = cls(str(datadir_with_binary)).stage_all(
+        str(tmp_path / "run"), run_duration=1
+    )
+
+    assert sorted(manifest) == sorted(
+        ["child.in", "grid.bin", os.path.join("inputs", "forcing.txt")]
+    )
+    for fname in manifest:
+        assert (tmp_path / "run" / fname).is_file()
+
+
+@pytest.fixture
+def many_files(tmp_path):
+    datadir = tmp_path / "data"
+    datadir.mkdir()
+    (datadir / "info.yaml").write_text("name: many\n")
+    for n in range(50):
+        (datadir / f"input-{n:02d}.txt").write_text(f"{n}: {{{{ value }}}}\n")
+        (datadir / f"grid-{n:02d}.bin").write_bytes(bytes([n]) * 1024)
+    return datadir
+
+
+@pytest.mark.parametrize("max_workers", (1, 4))
+def test_stage_all_manifest_is_deterministic(tmp_path, many_files, max_workers):
+    loader = FileSystemLoader(str(many_files), max_workers=max_workers)
+    manifest = loader.stage_all(str(tmp_path / "run"), value=7)
+
+    assert list(manifest) == sorted(os.listdir(tmp_path / "run"))
+    assert loader.stage_all(str(tmp_path / "run"), value=7) == manifest
+    assert (tmp_path / "run" / "input-13.txt").read_text() == "13: 7"
+    assert (tmp_path / "run" / "grid-13.bin").read_bytes() == bytes([13]) * 1024
+
+
+def test_old_loader_manifest_is_deterministic(tmp_path, many_files):
+    expected = OldFileSystemLoader(str(many_files), max_workers=1).stage_all(
+        str(tmp_path / "serial")
+    )
+    assert (
+        OldFileSystemLoader(str(many_files), max_workers=4).stage_all(
+            str(tmp_path / "parallel")
+        )
+        == expected
+    )
+
+
+@pytest.mark.parametrize("cls", (FileSystemLoader, OldFileSystemLoader))
+def test_stage_all_stops_on_first_error(tmp_path, many_files, monkeypatch, cls):
+    copied = []
+
+    def _copy_file(src, dst, *args):
+        copied.append(src)
+        raise OSError(f"{src}: unable to copy")
+
+    monkeypatch.setattr(model_setup, "_copy_file", _copy_file)
+
+    with pytest.raises(OSError):
+        cls(str(many_files), max_workers=2).stage_all(str(tmp_path / "run"))
+    assert len(copied) < 50
+
+
+def test_bad_max_workers(shared_datadir):
+    with pytest.raises(ValueError):
+        FileSystemLoader(str(shared_datadir), max_workers=0)
+
+
+def test_incremental_rewrite_keeps_mode(tmp_path, shared_datadir):
+    loader = FileSystemLoader(str(shared_datadir), incremental=True)
+    loader.stage_all(str(tmp_path), run_duration=1)
+    os.chmod(tmp_path / "child.in", 0o640)
+
+    assert loader.stage_all(str(tmp_path), run_duration=2).written == ("child.in",)
+    assert os.stat(tmp_path / "child.in").st_mode & 0o777 == 0o640
+    assert [fname for fname in os.listdir(tmp_path) if fname.endswith(".tmp")] == []
+
+
+@pytest.mark.parametrize("cls", (FileSystemLoader, OldFileSystemLoader))
+def test_incremental_does_not_write_unchanged(
+    tmp_path, shared_datadir, monkeypatch, cls
+):
+    loader = cls(str(shared_datadir), incremental=True)
+    loader.stage_all(str(tmp_path), run_duration=1)
+
+    def _mkstemp(*args, **kwds):
+        raise AssertionError("unchanged file should not be written")
+
+    monkeypatch.setattr(model_setup.tempfile, "mkstemp", _mkstemp)
+    stat = os.stat(tmp_path / "child.in")
+
+    assert loader.stage_all(str(tmp_path), run_duration=1).written == ()
+    assert os.stat(tmp_path / "child.in").st_mtime_ns == stat.st_mtime_ns
+
+
+def test_stream_matches_render(tmp_path, shared_datadir):
+    FileSystemLoader(str(shared_datadir)).stage_all(str(tmp_path), run_duration=1)
+
+    template = FileSystemLoader(str(shared_datadir)).environment.get_template(
+        "child.in"
+    )
+    assert (tmp_path / "child.in").read_text() == template.render(run_duration=1)
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import os
 import pathlib
+import pickle
 import sys
 
 import pytest
 from model_metadata import ModelMetadata
+from model_metadata._yaml import safe_dump
+from model_metadata.model_parameter import parameter_from_dict
 
 
 class FooBar:
@@ -57,3 +60,131 @@ def test_model_metadata_from_object(shared_datadir):
 
     meta = ModelMetadata.from_obj(FooBaz())
     assert shared_datadir.samefile(meta.base)
+
+
+@pytest.fixture
+def unimportable_module(tmp_path, monkeypatch):
+    (tmp_path / "unimportable_model.py").write_text(
+        """\
+import pathlib
+
+raise RuntimeError("module should not be imported")
+
+
+class WithString:
+    METADATA = "meta"
+
+
+class WithPath:
+    METADATA: pathlib.Path = pathlib.Path("meta", "data")
+
+
+class WithPathRoot:
+    METADATA = pathlib.Path("/")
+"""
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path
+    sys.modules.pop("unimportable_model", None)
+
+
+@pytest.mark.parametrize(
+    "class_name,expected",
+    (
+        ("WithString", "meta"),
+        ("WithPath", os.path.join("meta", "data")),
+    ),
+)
+def test_search_paths_without_import(unimportable_module, class_name, expected):
+    paths = ModelMetadata.search_paths(f"unimportable_model:{class_name}")
+
+    assert paths == (
+        os.path.realpath(unimportable_module / expected),
+        class_name,
+        os.path.join(sys.prefix, "share", "csdms", class_name),
+    )
+    assert "unimportable_model" not in sys.modules
+
+
+def test_search_paths_absolute_without_import(unimportable_module):
+    paths = ModelMetadata.search_paths("unimportable_model:WithPathRoot")
+    assert paths[0] == os.path.realpath("/")
+    assert "unimportable_model" not in sys.modules
+
+
+@pytest.mark.parametrize(
+    "source",
+    (
+        "class Model(Base):\n    pass\n",
+        "class Model:\n    METADATA = os.path.join('meta', 'data')\n",
+        "class Model:\n    METADATA = pathlib.Path(NAME)\n",
+    ),
+)
+def test_search_paths_falls_back_to_import(tmp_path, monkeypatch, source):
+    (tmp_path / "dynamic_model.py").write_text(
+        "import os\nimport pathlib\n\nNAME = 'meta'\n\n\n"
+        "class Base:\n    METADATA = 'meta'\n\n\n" + source
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        paths = ModelMetadata.search_paths("dynamic_model:Model")
+        assert "dynamic_model" in sys.modules
+    finally:
+        sys.modules.pop("dynamic_model", None)
+
+    assert paths[1:] == ("Model", os.path.join(sys.prefix, "share", "csdms", "Model"))
+    assert os.path.basename(paths[0]) in ("meta", "data")
+
+
+def test_search_paths_for_missing_module():
+    with pytest.raises(ImportError):
+        ModelMetadata.search_paths("not_a_module:Model")
+
+
+def test_model_metadata_is_read_only(shared_datadir):
+    meta = ModelMetadata(shared_datadir)
+
+    assert meta.meta is meta.meta
+    with pytest.raises(TypeError):
+        meta.meta["info"] = {}
+    with pytest.raises(TypeError):
+        meta.info["version"] = "0.0"
+    with pytest.raises(TypeError):
+        meta.parameters["run_duration"]["value"]["default"] = 0.0
+    with pytest.raises(TypeError):
+        meta.get("parameters.run_duration")["description"] = ""
+
+
+def test_model_metadata_lists_are_read_only(shared_datadir):
+    meta = ModelMetadata(shared_datadir)
+
+    authors = meta.info["authors"]
+    assert isinstance(authors, tuple)
+    assert authors == tuple(meta._meta["info"]["authors"])
+    assert meta.get("info.authors") is authors
+    with pytest.raises(AttributeError):
+        authors.append("Anonymous")
+    assert safe_dump(meta.info) == safe_dump(meta._meta["info"])
+
+
+def test_model_metadata_parameters_can_be_parsed(shared_datadir):
+    meta = ModelMetadata(shared_datadir)
+
+    run_duration = parameter_from_dict(meta.parameters["run_duration"])
+    assert run_duration.value == 5000.0
+    assert run_duration.range == (1.0, 1.79769313486e308)
+
+
+def test_model_metadata_dump(shared_datadir):
+    meta = ModelMetadata(shared_datadir)
+    assert meta.dump() == safe_dump(meta._meta)
+    assert "version" in meta.dump_section("info")
+
+
+def test_model_metadata_pickles(shared_datadir):
+    meta = ModelMetadata(shared_datadir)
+    meta.parameter_table()
+
+    unpickled = pickle.loads(pickle.dumps(meta))
+    assert unpickled.meta == meta.meta
+    assert unpickled.parameter_table().names == meta.parameter_table().names
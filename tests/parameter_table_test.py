@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+from model_metadata import ModelMetadata
+from model_metadata.errors import UnknownKeyError
+from model_metadata.model_parameter import normalize_parameters
+from model_metadata.parameter_table import ParameterTable
+
+
+@pytest.fixture
+def table():
+    return ParameterTable(
+        normalize_parameters(
+            {
+                "dt": {
+                    "description": "Time step",
+                    "value": {
+                        "type": "float",
+                        "default": 1.0,
+                        "units": "d",
+                        "range": {"min": 0.0, "max": 10.0},
+                    },
+                },
+                "n_steps": {"value": {"type": "int", "default": 5}},
+                "method": {
+                    "value": {
+                        "type": "choice",
+                        "default": "euler",
+                        "choices": ["euler", "rk4"],
+                    }
+                },
+                "verbose": {"value": {"type": "bool", "default": True}},
+            }
+        )
+    )
+
+
+def test_parameter_table_columns(table):
+    assert len(table) == 4
+    assert table.names == ("dt", "n_steps", "method", "verbose")
+    assert list(table) == list(table.names)
+    assert table.types == ("float", "int", "str", "bool")
+    assert table.units == ("d", None, None, None)
+    assert table.descriptions == ("Time step", None, None, None)
+    assert table.choices == (None, None, ("euler", "rk4"), (True, False))
+    assert table.defaults == (1.0, 5, "euler", True)
+    assert table.numeric == (True, True, False, False)
+
+
+def test_parameter_table_numeric_columns(table):
+    assert list(table.default[:2]) == [1.0, 5.0]
+    assert list(table.min[:2]) == [0.0, -math.inf]
+    assert list(table.max[:2]) == [10.0, math.inf]
+    for column in (table.default, table.min, table.max):
+        assert column.format == "d"
+        assert all(math.isnan(value) for value in column[2:])
+
+
+def test_parameter_table_is_read_only(table):
+    with pytest.raises(TypeError):
+        table.min[0] = 1.0
+
+
+def test_parameter_table_index(table):
+    assert table.index("method") == 2
+    assert "dt" in table
+    assert "foo" not in table
+    with pytest.raises(KeyError):
+        table.index("foo")
+
+
+def test_parameter_table_to_dict(table):
+    columns = table.to_dict()
+    assert list(columns) == [
+        "name",
+        "type",
+        "default",
+        "min",
+        "max",
+        "units",
+        "description",
+        "choices",
+    ]
+    assert columns["max"][0] == 10.0
+    assert all(len(values) == len(table) for values in columns.values())
+
+
+def test_parameter_table_empty():
+    table = ParameterTable({})
+    assert len(table) == 0
+    assert table.min.nbytes == 0
+
+
+def test_parameter_table_to_numpy(table):
+    np = pytest.importorskip("numpy")
+
+    array = table.to_numpy()
+    assert array.shape == (4,)
+    assert list(array["name"]) == ["dt", "n_steps", "method", "verbose"]
+    assert list(array["units"]) == ["d", "", "", ""]
+    np.testing.assert_array_equal(array["max"][:2], [10.0, np.inf])
+    np.testing.assert_array_equal(np.asarray(table.min), array["min"])
+
+
+def test_parameter_table_to_arrow(table):
+    pytest.importorskip("pyarrow")
+
+    arrow = table.to_arrow()
+    assert arrow.num_rows == 4
+    assert arrow.column("name").to_pylist() == list(table.names)
+    assert arrow.column("min").to_pylist()[:2] == [0.0, -math.inf]
+
+
+def test_parameter_table_to_pandas(table):
+    pytest.importorskip("pandas")
+
+    frame = table.to_pandas()
+    assert list(frame.index) == list(table.names)
+    assert frame.loc["dt", "max"] == 10.0
+
+
+def test_model_metadata_parameter_table(shared_datadir):
+    meta = ModelMetadata(shared_datadir)
+
+    table = meta.parameter_table()
+    assert table is meta.parameter_table()
+    assert table.names == tuple(meta.parameters)
+    assert table.min[table.index("run_duration")] == 1.0
+    assert math.isnan(table.min[table.index("uplift_type")])
+
+
+def test_check_samples_from_matrix(table):
+    np = pytest.importorskip("numpy")
+
+    samples = np.array(
+        [
+            [1.0, 5, 0, 1],
+            [-1.0, 5, 0, 1],
+            [20.0, 5.5, 0, 1],
+            [np.nan, 5, 0, 2],
+        ],
+        dtype=float,
+    )
+    valid, violations = table.check_samples(samples[:, :2], names=["dt", "n_steps"])
+    assert valid.tolist() == [True, False, False, False]
+    assert violations == {"dt": 3, "n_steps": 1}
+
+    valid, violations = table.check_samples(samples)
+    assert valid.tolist() == [False, False, False, False]
+    assert violations == {"dt": 3, "n_steps": 1, "method": 4, "verbose": 1}
+
+
+def test_check_samples_from_dict(table):
+    np = pytest.importorskip("numpy")
+
+    result = table.check_samples(
+        {
+            "method": np.array(["euler", "rk4", "rk45"]),
+            "verbose": [True, False, True],
+            "n_steps": np.array([1, 2, 3]),
+        }
+    )
+    assert result.valid.tolist() == [True, True, False]
+    assert result.violations == {"method": 1, "verbose": 0, "n_steps": 0}
+
+
+@pytest.mark.parametrize(
+    "values,expected",
+    (
+        (["1.0", "2.0"], [True, True]),
+        (["1.0", "20.0", "a"], [True, False, False]),
+        ([1.0, None], [True, False]),
+        ([1.0, "2.0", "a", None], [True, True, False, False]),
+    ),
+)
+def test_check_samples_checks_type(table, values, expected):
+    np = pytest.importorskip("numpy")
+
+    valid, _ = table.check_samples({"dt": np.array(values)})
+    assert valid.tolist() == expected
+
+
+def test_check_samples_from_mixed_matrix(table):
+    pytest.importorskip("numpy")
+
+    samples = [[1.0, 5, "euler", True], [5.0, 2.5, "rk4", False], [-1.0, 1, "a", 0]]
+    valid, violations = table.check_samples(samples)
+    assert valid.tolist() == [True, False, False]
+    assert violations == {"dt": 1, "n_steps": 1, "method": 1, "verbose": 1}
+
+    valid, violations = table.check_samples(
+        [[1.0, "euler"], [5.0, "rk4"]], names=["dt", "method"]
+    )
+    assert valid.tolist() == [True, True]
+    assert violations == {"dt": 0, "method": 0}
+
+
+def test_check_samples_empty(table):
+    np = pytest.importorskip("numpy")
+
+    valid, violations = table.check_samples({})
+    assert valid.shape == (0,)
+    assert violations == {}
+
+    valid, violations = table.check_samples(np.empty((0, 4)))
+    assert valid.shape == (0,)
+    assert violations == dict.fromkeys(table.names, 0)
+
+
+def test_check_samples_unknown_parameter(table):
+    pytest.importorskip("numpy")
+
+    with pytest.raises(UnknownKeyError, match="'foo'"):
+        table.check_samples({"dt": [1.0], "foo": [1.0]})
+    with pytest.raises(UnknownKeyError, match="'foo'"):
+        table.check_samples([[1.0]], names=["foo"])
+
+
+@pytest.mark.parametrize(
+    "samples,names",
+    (
+        ([1.0, 2.0], None),
+        ([[1.0, 2.0]], ["dt"]),
+        ([[1.0, 2.0]], ["dt", "dt"]),
+        ({"dt": [1.0, 2.0], "n_steps": [1]}, None),
+        ({"dt": [[1.0, 2.0]]}, None),
+    ),
+)
+def test_check_samples_bad_shape(table, samples, names):
+    pytest.importorskip("numpy")
+
+    with pytest.raises(ValueError):
+        table.check_samples(samples, names=names)
@@ -1,8 +1,21 @@
 from __future__ import annotations
 
+import copy
+import math
+import pickle
+import warnings
+from types import MappingProxyType
+
 import pytest
+from model_metadata import model_parameter
+from model_metadata.model_parameter import BooleanParameter
+from model_metadata.model_parameter import ChoiceParameter
+from model_metadata.model_parameter import FileParameter
 from model_metadata.model_parameter import FloatParameter
 from model_metadata.model_parameter import IntParameter
+from model_metadata.model_parameter import normalize_parameters
+from model_metadata.model_parameter import parameter_from_dict
+from model_metadata.model_parameter import StringParameter
 
 
 @pytest.mark.parametrize("value", (1973, 1973.0, 1973.5, "1973"))
@@ -17,3 +30,228 @@ def test_float_parameter(value):
     p = FloatParameter(value)
     assert isinstance(p.value, float)
     assert p.value == 3.14
+
+
+PARAMETERS = {
+    "float": {"description": "A float", "value": {"type": "float", "default": 1}},
+    "double": {
+        "desc": "A double",
+        "value": {
+            "type": "double",
+            "default": 2.5,
+            "range": {"min": 0.0, "max": 10.0},
+            "units": "m",
+        },
+    },
+    "int": {
+        "description": "An int",
+        "value": {"type": "int", "default": 3, "range": [0, None], "units": None},
+    },
+    "inferred_float": {"value": {"default": 1.0, "range": {"min": -1, "max": 1}}},
+    "inferred_int": {"value": {"default": 7, "units": "s"}},
+    "float_from_str": {"value": {"type": "float", "default": "1e3"}},
+    "int_from_float": {"value": {"type": "int", "default": 3.0}},
+    "big_int": {"value": {"type": "int", "default": 2**60, "range": [0, 2**61]}},
+    "nan": {"value": {"type": "float", "default": float("nan"), "range": [0, 1]}},
+    "choice": {"value": {"type": "choice", "default": 1, "choices": [0, 1, 2]}},
+    "inferred_choice": {"value": {"default": "b", "choices": ["a", "b"]}},
+    "string": {"description": "A string", "value": {"type": "str", "default": 4}},
+    "inferred_string": {"value": {"default": "lorem ipsum"}},
+    "bool": {"value": {"type": "bool", "default": True}},
+    "bool_values": {
+        "value": {"default": "yes", "true_value": "yes", "false_value": "no"}
+    },
+    "file": {"value": {"type": "file", "default": "a.txt", "choices": ["a.txt"]}},
+    "not_a_dict": {"description": "A scalar value", "value": 5.5},
+}
+
+
+@pytest.fixture(params=("python", "numpy"))
+def bulk(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(model_parameter, "_MIN_VECTORIZED_SIZE", 0)
+    else:
+        monkeypatch.setattr(model_parameter, "_import_numpy", lambda: None)
+    return request.param
+
+
+def _one_at_a_time(params):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return {
+            name: parameter_from_dict(param).as_dict() for name, param in params.items()
+        }
+
+
+def test_normalize_parameters_matches_parameter_from_dict(bulk):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        normed = normalize_parameters(PARAMETERS)
+    expected = _one_at_a_time(PARAMETERS)
+
+    assert list(normed) == list(expected)
+    for name in expected:
+        assert type(normed[name]["value"]["default"]) is type(
+            expected[name]["value"]["default"]
+        )
+        if name == "nan":
+            assert math.isnan(normed[name]["value"].pop("default"))
+            assert math.isnan(expected[name]["value"].pop("default"))
+        assert normed[name] == expected[name], name
+
+
+@pytest.mark.parametrize("name", list(PARAMETERS))
+def test_parameter_from_dict_does_not_mutate(name):
+    param = PARAMETERS[name]
+    expected = copy.deepcopy(param)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        parameter_from_dict(param)
+        normalize_parameters({name: param})
+
+    assert repr(param) == repr(expected)
+
+
+def test_parameter_from_read_only_dict():
+    param = MappingProxyType(
+        {
+            "description": "Time step",
+            "value": MappingProxyType(
+                {
+                    "type": "float",
+                    "default": 1.0,
+                    "range": MappingProxyType({"min": 0, "max": 2}),
+                }
+            ),
+        }
+    )
+    assert parameter_from_dict(param).range == (0, 2)
+    assert normalize_parameters({"dt": param})["dt"]["value"]["range"] == {
+        "min": 0,
+        "max": 2,
+    }
+
+
+def test_normalize_many_parameters(bulk):
+    params = {
+        f"param_{n}": {
+            "description": f"Parameter {n}",
+            "value": {"type": "float", "default": n, "range": {"min": 0, "max": 1e6}},
+        }
+        for n in range(1000)
+    }
+    assert normalize_parameters(params) == _one_at_a_time(params)
+
+
+@pytest.mark.parametrize(
+    "value,message",
+    (
+        ({"type": "float", "default": -1.0, "range": [0, 1]}, "below lower bound"),
+        ({"type": "int", "default": 11, "range": {"min": 0, "max": 10}}, "above upper"),
+        ({"type": "choice", "default": 3, "choices": [0, 1]}, "not contained"),
+        ({"type": "not_a_type", "default": 3}, "unknown parameter type"),
+    ),
+)
+def test_normalize_parameters_names_bad_parameter(bulk, value, message):
+    params = {
+        f"param_{n}": {"value": {"type": "float", "default": 0.5, "range": [0, 1]}}
+        for n in range(100)
+    }
+    params["param_42"]["value"] = value
+
+    with pytest.raises(ValueError, match=f"^param_42: .*{message}"):
+        normalize_parameters(params)
+
+
+def test_normalize_parameters_reports_first_error(bulk):
+    params = {
+        "ok": {"value": {"type": "float", "default": 0.5, "range": [0, 1]}},
+        "out_of_bounds": {"value": {"type": "float", "default": 5.0, "range": [0, 1]}},
+        "bad_choice": {"value": {"type": "choice", "default": 3, "choices": [0]}},
+        "also_out_of_bounds": {"value": {"type": "int", "default": 5, "range": [0, 1]}},
+    }
+    with pytest.raises(ValueError, match="^out_of_bounds: "):
+        normalize_parameters(params)
+
+
+@pytest.mark.parametrize(
+    "param,expected",
+    (
+        (
+            FloatParameter(1.5, desc="x", range=(0, 2), units="m"),
+            "FloatParameter(1.5, desc='x', units='m', range=(0, 2)) ",
+        ),
+        (
+            IntParameter(3),
+            "IntParameter(3, desc=None, units=None, range=(None, None)) ",
+        ),
+        (StringParameter("s", desc="d"), "StringParameter('s', desc='d') "),
+        (
+            ChoiceParameter(1, choices=[0, 1]),
+            "ChoiceParameter(1, desc=None, choices=(0, 1)) ",
+        ),
+        (
+            BooleanParameter(True),
+            "BooleanParameter(True, desc=None, true_value=True, false_value=False) ",
+        ),
+        (
+            FileParameter("a.txt"),
+            "FileParameter('a.txt', desc=None, files=('a.txt',)) ",
+        ),
+    ),
+)
+def test_parameter_repr(param, expected):
+    assert repr(param) == expected
+    assert not hasattr(param, "__dict__")
+
+
+def test_as_dict_is_cached():
+    param = FloatParameter(1.5, range=(0, 2), units="m")
+    assert param.as_dict() is param.as_dict()
+    assert param.as_dict() == {
+        "description": None,
+        "value": {
+            "default": 1.5,
+            "type": "float",
+            "units": "m",
+            "range": {"min": 0, "max": 2},
+        },
+    }
+
+
+def test_freeze():
+    param = IntParameter(3, range=(0, 10))
+    assert not param.frozen
+    assert param.freeze() is param
+    assert param.frozen
+
+    with pytest.raises(AttributeError):
+        param._value = 4
+    with pytest.raises(AttributeError):
+        del param._units
+
+    assert param.value == 3
+    assert param.as_dict()["value"]["default"] == 3
+    assert isinstance(param, IntParameter)
+    assert repr(param) == "IntParameter(3, desc=None, units=None, range=(0, 10)) "
+
+
+def test_freeze_does_not_affect_other_parameters():
+    frozen = FloatParameter(1.0).freeze()
+    param = FloatParameter(2.0)
+
+    assert frozen.frozen
+    assert not param.frozen
+    param._value = 3.0
+    assert param.value == 3.0
+
+
+def test_frozen_parameter_pickles():
+    param = FloatParameter(1.5, range=(0, 2), units="m").freeze()
+    unpickled = pickle.loads(pickle.dumps(param))
+
+    assert unpickled.frozen
+    assert repr(unpickled) == repr(param)
+    assert type(unpickled) is type(param)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import shutil
+
+import pytest
+from model_metadata import ModelMetadata
+from model_metadata.errors import MetadataNotFoundError
+from model_metadata.main import main
+from model_metadata.registry import build_index
+from model_metadata.registry import load_index
+from model_metadata.registry import lookup
+from model_metadata.registry import write_index
+
+
+class Model:
+    pass
+
+
+@pytest.fixture
+def sharedir(tmp_path, shared_datadir):
+    sharedir = tmp_path / "share" / "csdms"
+    sharedir.mkdir(parents=True)
+    shutil.copytree(shared_datadir, sharedir / "Child")
+    (sharedir / "not-a-model").mkdir()
+    return sharedir
+
+
+@pytest.fixture
+def path_to_index(tmp_path, monkeypatch):
+    path_to_index = tmp_path / "index.json"
+    monkeypatch.setenv("MODEL_METADATA_INDEX", str(path_to_index))
+    return path_to_index
+
+
+def test_build_index(sharedir):
+    with pytest.warns(UserWarning, match="not-a-model"):
+        index = build_index(str(sharedir))
+
+    path_to_child = os.path.realpath(sharedir / "Child")
+    assert index["models"] == {
+        path_to_child: {
+            "name": "child",
+            "version": "10.6",
+            "summary": ModelMetadata(path_to_child).info["summary"],
+        }
+    }
+    assert index["lookup"] == {"Child": path_to_child, "child": path_to_child}
+
+
+@pytest.mark.parametrize(
+    "fname,contents",
+    (("api.yaml", "language: c\n"), ("info.yaml", "name: [not, closed\n")),
+)
+def test_build_index_skips_broken_models(sharedir, shared_datadir, fname, contents):
+    broken = shutil.copytree(shared_datadir, sharedir / "Broken")
+    (broken / fname).write_text(contents)
+
+    with pytest.warns(UserWarning) as record:
+        index = build_index(str(sharedir))
+
+    messages = [str(warning.message) for warning in record]
+    assert any("Broken: skipping" in msg and "Error" in msg for msg in messages)
+    assert index["lookup"] == {
+        "Child": os.path.realpath(sharedir / "Child"),
+        "child": os.path.realpath(sharedir / "Child"),
+    }
+
+
+def test_build_index_with_entry_point(tmp_path, shared_datadir):
+    Model.METADATA = shared_datadir
+    index = build_index(str(tmp_path), entry_points=[f"{__name__}:Model"])
+
+    assert index["lookup"][f"{__name__}:Model"] == os.path.realpath(shared_datadir)
+
+
+def test_build_index_with_bad_entry_point(tmp_path):
+    with pytest.warns(UserWarning, match="skipping"):
+        index = build_index(str(tmp_path), entry_points=["not_a_module:Model"])
+    assert index["lookup"] == {}
+
+
+def test_write_and_load_index(sharedir, path_to_index):
+    with pytest.warns(UserWarning):
+        index = build_index(str(sharedir))
+    assert write_index(index) == str(path_to_index)
+    assert json.loads(path_to_index.read_text()) == index
+
+    assert load_index() == index
+    assert lookup("child") == os.path.realpath(sharedir / "Child")
+    assert lookup("not-a-model") is None
+
+
+def test_load_missing_or_bad_index(path_to_index):
+    assert load_index()["lookup"] == {}
+
+    path_to_index.write_text("not json")
+    assert load_index()["lookup"] == {}
+
+
+def test_lookup_ignores_removed_folders(sharedir, path_to_index):
+    with pytest.warns(UserWarning):
+        write_index(build_index(str(sharedir)))
+    shutil.rmtree(sharedir / "Child")
+
+    assert lookup("child") is None
+
+
+def test_find_entry_point_without_import(shared_datadir, path_to_index):
+    write_index(
+        {
+            "format": 1,
+            "models": {},
+            "lookup": {"not_a_module:Model": str(shared_datadir)},
+        }
+    )
+    assert ModelMetadata.find("not_a_module:Model") == str(shared_datadir)
+
+
+def test_find_name_in_index(tmp_path, shared_datadir, path_to_index):
+    write_index({"format": 1, "models": {}, "lookup": {"child": str(shared_datadir)}})
+    with contextlib.chdir(tmp_path):
+        assert ModelMetadata.find("child") == str(shared_datadir)
+
+        os.mkdir("child")
+        assert ModelMetadata.find("child") == "child"
+
+    with pytest.raises(MetadataNotFoundError):
+        ModelMetadata.find("not-a-model")
+
+
+def test_index_subcommand(capsys, sharedir, path_to_index):
+    with contextlib.suppress(SystemExit), pytest.warns(UserWarning):
+        assert main(["index", "--sharedir", str(sharedir)]) == 0
+    assert capsys.readouterr().out.strip() == str(path_to_index)
+
+    with contextlib.suppress(SystemExit):
+        assert main(["index", "--list"]) == 0
+    assert capsys.readouterr().out.strip() == (
+        f"child: {os.path.realpath(sharedir / 'Child')}"
+    )
+
+
+def test_index_subcommand_with_broken_model(
+    capsys, sharedir, shared_datadir, path_to_index
+):
+    broken = shutil.copytree(shared_datadir, sharedir / "Broken")
+    (broken / "api.yaml").write_text("language: c\n")
+
+    with contextlib.suppress(SystemExit), pytest.warns(UserWarning):
+        assert main(["index", "--sharedir", str(sharedir)]) == 0
+    assert capsys.readouterr().out.strip() == str(path_to_index)
+    assert load_index(str(path_to_index))["lookup"]["child"] == os.path.realpath(
+        sharedir / "Child"
+    )
+
+
+def test_find_subcommand_uses_index(capsys, shared_datadir, path_to_index):
+    write_index(
+        {
+            "format": 1,
+            "models": {},
+            "lookup": {"not_a_module:Model": str(shared_datadir)},
+        }
+    )
+    with contextlib.suppress(SystemExit):
+        assert main(["find", "not_a_module:Model"]) == 0
+    assert capsys.readouterr().out.strip() == str(shared_datadir)
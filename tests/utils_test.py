@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+from model_metadata import _utils
+from model_metadata._utils import as_cwd
+from model_metadata._utils import is_text_file
+from model_metadata._utils import link_file
+
+
+@pytest.fixture
+def src(tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"\x00\x01\x02")
+    return src
+
+
+@pytest.mark.parametrize("mode", ("copy", "hardlink", "symlink"))
+def test_link_file(tmp_path, src, mode):
+    dst = tmp_path / "dst.bin"
+    assert link_file(str(src), str(dst), mode=mode) == mode
+    assert dst.read_bytes() == b"\x00\x01\x02"
+
+    assert os.path.islink(dst) == (mode == "symlink")
+    assert os.path.samefile(src, dst) == (mode != "copy")
+
+
+def test_link_file_reflink(tmp_path, src):
+    dst = tmp_path / "dst.bin"
+    assert link_file(str(src), str(dst), mode="reflink") in ("reflink", "copy")
+    assert dst.read_bytes() == b"\x00\x01\x02"
+    assert not os.path.islink(dst)
+    assert not os.path.samefile(src, dst)
+
+
+@pytest.mark.parametrize("mode", ("hardlink", "symlink", "reflink"))
+def test_link_file_falls_back_to_copy(tmp_path, src, monkeypatch, mode):
+    def _fail(*args, **kwds):
+        raise OSError("not supported")
+
+    monkeypatch.setattr(os, "link", _fail)
+    monkeypatch.setattr(os, "symlink", _fail)
+    monkeypatch.setattr(_utils, "_reflink", _fail)
+
+    dst = tmp_path / "dst.bin"
+    assert link_file(str(src), str(dst), mode=mode) == "copy"
+    assert dst.read_bytes() == b"\x00\x01\x02"
+    assert not os.path.samefile(src, dst)
+
+
+@pytest.mark.parametrize("mode", ("copy", "hardlink", "symlink"))
+@pytest.mark.parametrize("existing_mode", ("copy", "hardlink", "symlink"))
+def test_link_file_replaces_existing(tmp_path, src, mode, existing_mode):
+    dst = tmp_path / "dst.bin"
+    link_file(str(src), str(dst), mode=existing_mode)
+    link_file(str(src), str(dst), mode=mode)
+
+    assert src.read_bytes() == b"\x00\x01\x02"
+    assert dst.read_bytes() == b"\x00\x01\x02"
+
+
+def test_link_file_bad_mode(tmp_path, src):
+    with pytest.raises(ValueError):
+        link_file(str(src), str(tmp_path / "dst.bin"), mode="teleport")
+
+
+def test_as_cwd_restores_cwd_on_error(tmp_path):
+    cwd = os.getcwd()
+    with pytest.raises(RuntimeError), as_cwd(str(tmp_path / "foo")):
+        assert os.getcwd() == str(tmp_path / "foo")
+        raise RuntimeError()
+    assert os.getcwd() == cwd
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    opened = []
+    _open = open
+
+    def _counting_open(file, *args, **kwds):
+        opened.append(os.path.basename(file))
+        return _open(file, *args, **kwds)
+
+    monkeypatch.setattr("builtins.open", _counting_open)
+    return opened
+
+
+@pytest.mark.parametrize(
+    "fname,contents,expected",
+    (
+        ("child", b"RUNTIME: 100\n", True),
+        ("child", b"\x00\x01\x02", False),
+        ("empty", b"", True),
+        ("child.in", b"RUNTIME: 100\n", True),
+        ("grid.nc", b"CDF\x01\x00\x00", False),
+    ),
+)
+def test_is_text_file(tmp_path, fname, contents, expected):
+    (tmp_path / fname).write_bytes(contents)
+    assert is_text_file(str(tmp_path / fname)) is expected
+
+
+@pytest.mark.parametrize("fname", ("child.IN", "grid.nc", "elevation.TIF"))
+def test_is_text_file_by_extension(tmp_path, fname, opened):
+    (tmp_path / fname).write_bytes(b"")
+    is_text_file(str(tmp_path / fname))
+    assert opened == []
+
+
+def test_is_text_file_is_cached(tmp_path, opened):
+    path = tmp_path / "child"
+    path.write_bytes(b"RUNTIME: 100\n")
+
+    assert is_text_file(str(path))
+    assert is_text_file(str(path))
+    assert opened == ["child"]
+
+    with open(path, "wb") as fp:
+        fp.write(b"\x00\x01\x02\x03")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert not is_text_file(str(path))
+    assert opened == ["child", "child", "child"]
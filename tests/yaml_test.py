@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import subprocess
+import sys
+from collections import OrderedDict
+from types import MappingProxyType
+
 import pytest
 import yaml
+from model_metadata import ModelMetadata
+from model_metadata._yaml import _make_metadata_yaml
+from model_metadata._yaml import safe_dump
+from model_metadata._yaml import safe_load_all
 from model_metadata.model_parameter import setup_yaml_with_canonical_dict
 from pytest import approx
 
-
 setup_yaml_with_canonical_dict()
 
 
@@ -43,3 +51,81 @@ def test_load_ten(sign, coefficient, letter, expsign, exponent):
     if sign == "-":
         val *= -1
     assert val == approx(10.0)
+
+
+YAML_CLASSES = [_make_metadata_yaml(yaml.SafeLoader, yaml.SafeDumper)]
+if yaml.__with_libyaml__:
+    YAML_CLASSES.append(_make_metadata_yaml(yaml.CSafeLoader, yaml.CSafeDumper))
+LOADERS = [Loader for Loader, _ in YAML_CLASSES]
+DUMPERS = [Dumper for _, Dumper in YAML_CLASSES]
+
+
+@pytest.mark.parametrize("Loader", LOADERS)
+@pytest.mark.parametrize(
+    "text,expected",
+    (("1e3", 1000.0), ("-.1E+3", -100.0), ("100.e-1", 10.0), ("1", 1), ("1.", 1.0)),
+)
+def test_float_resolver(Loader, text, expected):
+    val = yaml.load(text, Loader=Loader)
+    assert type(val) is type(expected)
+    assert val == approx(expected)
+
+
+@pytest.mark.parametrize(
+    "fname", ("api.yaml", "info.yaml", "parameters.yaml", "run.yaml")
+)
+def test_loader_parity(shared_datadir, fname):
+    contents = (shared_datadir / fname).read_text()
+    expected = list(yaml.load_all(contents, Loader=LOADERS[0]))
+
+    for Loader in LOADERS:
+        assert list(yaml.load_all(contents, Loader=Loader)) == expected
+    assert list(safe_load_all(contents)) == expected
+
+
+def test_dumper_parity(shared_datadir):
+    meta = ModelMetadata(shared_datadir).meta
+    data = [
+        meta,
+        OrderedDict([("b", 1), ("a", 2)]),
+        {"b": (1, 2.5, "three"), "a": "multi\nline\n"},
+        {"c": {"z": 1.0e-10, "y": float("inf")}},
+    ]
+    for value in data:
+        expected = yaml.dump(value, Dumper=DUMPERS[0])
+
+        for Dumper in DUMPERS:
+            assert yaml.dump(value, Dumper=Dumper) == expected
+        assert safe_dump(value) == expected
+        assert ModelMetadata.format(value) == expected
+
+
+def test_dump_read_only_mapping():
+    data = {"b": {"d": 1, "c": (2, 3)}, "a": "multi\nline\n"}
+    view = MappingProxyType({**data, "b": MappingProxyType(data["b"])})
+    assert safe_dump(view) == safe_dump(data)
+
+
+def test_dump_round_trip(shared_datadir):
+    dumped = ModelMetadata(shared_datadir).dump()
+    assert [safe_dump(doc) for doc in safe_load_all(dumped)] == [dumped]
+
+
+def test_import_has_no_global_side_effects(shared_datadir):
+    script = f"""
+import yaml
+
+loaders = (yaml.SafeLoader, getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+dumpers = (yaml.SafeDumper, getattr(yaml, "CSafeDumper", yaml.SafeDumper))
+before = [dict(Loader.yaml_implicit_resolvers) for Loader in loaders]
+before += [dict(Dumper.yaml_representers) for Dumper in dumpers]
+
+from model_metadata import ModelMetadata
+ModelMetadata({str(shared_datadir)!r}).dump()
+
+after = [dict(Loader.yaml_implicit_resolvers) for Loader in loaders]
+after += [dict(Dumper.yaml_representers) for Dumper in dumpers]
+assert before == after
+assert yaml.safe_load("1e3") == "1e3"
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)